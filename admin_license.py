@@ -206,6 +206,9 @@ def list_licenses(args):
         console.print("[yellow]No licenses found[/yellow]")
         return
 
+    # Apply any pending schema migration before reading raw rows
+    LicenseManager(db_path)
+
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
@@ -238,7 +241,7 @@ def list_licenses(args):
         display_key = license_key[:20] + "..." if len(license_key) > 20 else license_key
 
         # Calculate status
-        expiry = datetime.fromisoformat(expiry_date)
+        expiry = datetime.utcfromtimestamp(expiry_date)
         is_expired = datetime.utcnow() > expiry
 
         if is_expired:
@@ -252,7 +255,7 @@ def list_licenses(args):
             display_key,
             tier.upper(),
             email,
-            expiry_date[:10],
+            expiry.strftime('%Y-%m-%d'),
             status,
             str(activation_count)
         )
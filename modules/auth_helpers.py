@@ -3,13 +3,73 @@ Authentication Helpers for Streamlit
 Session state management and protected pages
 """
 
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
 import streamlit as st
+import streamlit.components.v1 as components
 from typing import Optional, Dict, Callable
 from modules.user_manager import get_user_manager
 
+# "Remember me" cookie: session token + expiry, HMAC-signed so forged or
+# tampered cookies are rejected without a database lookup. Logging out
+# deletes the session row, which revokes the cookie too.
+_AUTH_COOKIE = 'botx_session'
+_AUTH_COOKIE_MAX_AGE = 7 * 24 * 3600  # Same lifetime as the DB session
+# Without a configured secret, cookies only survive until the next restart
+_AUTH_COOKIE_SECRET = os.getenv('AUTH_COOKIE_SECRET', '').encode() or secrets.token_bytes(32)
+
+# Reverse proxies in front of the app that append to X-Forwarded-For.
+# 0 = the header is client-controlled and ignored.
+_TRUSTED_PROXIES = int(os.getenv('TRUSTED_PROXIES', '0'))
+
+
+def _sign(payload: str) -> str:
+    """HMAC-SHA256 of payload (hex)"""
+    return hmac.new(_AUTH_COOKIE_SECRET, payload.encode(), hashlib.sha256).hexdigest()
+
+
+def _make_auth_cookie(session_token: str) -> str:
+    """Cookie value for session_token: token|expiry|signature"""
+    payload = f"{session_token}|{int(time.time()) + _AUTH_COOKIE_MAX_AGE}"
+    return f"{payload}|{_sign(payload)}"
+
+
+def _read_auth_cookie() -> Optional[str]:
+    """
+    Session token from the auth cookie
+
+    Returns:
+        Token if the cookie is present, correctly signed and unexpired
+    """
+    value = st.context.cookies.get(_AUTH_COOKIE)
+    if not value or value.count('|') != 2:
+        return None
+
+    token, expires, signature = value.split('|')
+    if not hmac.compare_digest(signature, _sign(f"{token}|{expires}")):
+        return None
+    if not expires.isdigit() or int(expires) < time.time():
+        return None
+    return token
+
+
+def _write_auth_cookie(value: str, max_age: int):
+    """Set (or with max_age=0 clear) the auth cookie in the browser"""
+    cookie = f"{_AUTH_COOKIE}={value}; Max-Age={max_age}; Path=/; SameSite=Strict"
+    components.html(f"""
+    <script>
+        const secure = window.parent.location.protocol === 'https:' ? '; Secure' : '';
+        window.parent.document.cookie = {json.dumps(cookie)} + secure;
+    </script>
+    """, height=0)
+
 
 def init_session_state():
-    """Initialize authentication session state"""
+    """Initialize authentication session state (restores a remembered login)"""
     if 'authenticated' not in st.session_state:
         st.session_state.authenticated = False
     if 'user' not in st.session_state:
@@ -17,6 +77,23 @@ def init_session_state():
     if 'session_token' not in st.session_state:
         st.session_state.session_token = None
 
+    # Cookie writes are deferred to here: login/logout are followed by
+    # st.rerun(), which would drop the script element before it ran
+    pending = st.session_state.pop('_auth_cookie_pending', None)
+    if pending is not None:
+        _write_auth_cookie(*pending)
+
+    # New browser session: check the cookie once
+    if not st.session_state.authenticated and '_auth_cookie_checked' not in st.session_state:
+        st.session_state._auth_cookie_checked = True
+        token = _read_auth_cookie()
+        if token:
+            valid, user_data = get_user_manager().validate_session(token)
+            if valid:
+                st.session_state.authenticated = True
+                st.session_state.user = user_data
+                st.session_state.session_token = token
+
 
 def is_authenticated() -> bool:
     """Check if user is authenticated"""
@@ -30,12 +107,32 @@ def get_current_user() -> Optional[Dict]:
     return st.session_state.user
 
 
-def login_user(user_data: Dict, session_token: str):
-    """Set user as logged in"""
+def get_client_ip() -> Optional[str]:
+    """
+    Client IP for this session
+
+    X-Forwarded-For is only used with TRUSTED_PROXIES set: each trusted
+    proxy appends the address it received the request from, so the client
+    is the entry that many hops from the right. Anything to the left of it
+    was sent by the client and can't be trusted.
+    """
+    if _TRUSTED_PROXIES > 0:
+        forwarded = st.context.headers.get('X-Forwarded-For')
+        hops = [hop.strip() for hop in forwarded.split(',')] if forwarded else []
+        if len(hops) >= _TRUSTED_PROXIES:
+            return hops[-_TRUSTED_PROXIES]
+    return st.context.ip_address
+
+
+def login_user(user_data: Dict, session_token: str, remember: bool = False):
+    """Set user as logged in (remember: keep the login across browser sessions)"""
     st.session_state.authenticated = True
     st.session_state.user = user_data
     st.session_state.session_token = session_token
 
+    if remember:
+        st.session_state._auth_cookie_pending = (_make_auth_cookie(session_token), _AUTH_COOKIE_MAX_AGE)
+
 
 def logout_user():
     """Logout current user"""
@@ -50,6 +147,9 @@ def logout_user():
     st.session_state.user = None
     st.session_state.session_token = None
 
+    # Forget the remembered login in the browser
+    st.session_state._auth_cookie_pending = ('', 0)
+
 
 def require_auth(func: Callable):
     """Decorator to require authentication for a page"""
@@ -0,0 +1,207 @@
+"""
+CSS Utilities
+Minify/parse/merge stylesheets and ship them into the parent page <head>
+"""
+
+import re
+import json
+import hashlib
+from functools import cache
+from pathlib import Path
+from typing import Optional
+
+
+def minify_css(css: str) -> str:
+    """Minify a stylesheet: drop <style> tags and comments, collapse whitespace"""
+    css = re.sub(r'</?style>', '', css)
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{}:;,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def parse_css(css: str, pos: int = 0):
+    """
+    Parse minified CSS into a list of (prelude, body) rules
+
+    body is the declaration string for style rules and a nested rule list
+    for at-rules (@media, @supports).
+
+    Returns:
+        (rules, position after the enclosing block)
+    """
+    rules = []
+    while pos < len(css):
+        if css[pos] == '}':
+            return rules, pos + 1
+        brace = css.index('{', pos)
+        prelude = css[pos:brace]
+        if prelude.startswith('@'):
+            body, pos = parse_css(css, brace + 1)
+        else:
+            end = css.index('}', brace)
+            body, pos = css[brace + 1:end], end + 1
+        rules.append((prelude, body))
+    return rules, pos
+
+
+def _set_declaration(decls: dict, prop: str, value: str):
+    """Apply a declaration on top of decls the way the cascade would"""
+    if decls.get(prop, '').endswith('!important') and not value.endswith('!important'):
+        return
+    # Re-insert at the end so it still follows any longhands it overrides
+    decls.pop(prop, None)
+    decls[prop] = value
+
+
+def parse_declarations(body: str) -> dict:
+    """Split a declaration block into an ordered {property: value}"""
+    decls = {}
+    for decl in body.split(';'):
+        if ':' in decl:
+            prop, value = decl.split(':', 1)
+            _set_declaration(decls, prop, value)
+    return decls
+
+
+def _property_families(decls: dict) -> set:
+    """Property families (padding, padding-top -> padding) for conflict checks"""
+    return {prop.lstrip('-').split('-')[0] for prop in decls}
+
+
+def _merge_rules(rules) -> list:
+    """
+    Merge style rules that repeat a selector within the same block
+
+    A later rule is folded into the earlier one only if no rule in between
+    touches the same properties (and no at-rule is in between), so the
+    cascade result is unchanged.
+    """
+    merged = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            merged.append((prelude, _merge_rules(body)))
+            continue
+
+        decls = parse_declarations(body)
+        families = _property_families(decls)
+        target = None
+        for other_prelude, other in reversed(merged):
+            if isinstance(other, list):
+                break
+            if other_prelude == prelude:
+                target = other
+                break
+            if families & _property_families(other):
+                break
+
+        if target is None:
+            merged.append((prelude, decls))
+        else:
+            for prop, value in decls.items():
+                _set_declaration(target, prop, value)
+    return merged
+
+
+def serialize_rules(rules) -> str:
+    """Inverse of parse_css for (possibly merged) rules"""
+    out = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            inner = serialize_rules(body)
+        else:
+            inner = ';'.join(f"{prop}:{value}" for prop, value in body.items())
+        out.append(f"{prelude}{{{inner}}}")
+    return ''.join(out)
+
+
+def optimize_css(css: str) -> str:
+    """Minify a stylesheet and merge rules that repeat a selector"""
+    return serialize_rules(_merge_rules(parse_css(minify_css(css))[0]))
+
+
+# Streamlit serves <main script dir>/static at app/static/
+# (requires server.enableStaticServing, see .streamlit/config.toml)
+_STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+
+
+@cache
+def publish_static_css(name: str, css: str) -> Optional[str]:
+    """
+    Make sure static/<name> matches css
+
+    Returns:
+        Versioned URL of the static stylesheet, or None if it can't be written
+    """
+    path = _STATIC_DIR / name
+    try:
+        if not path.exists() or path.read_text(encoding='utf-8') != css:
+            _STATIC_DIR.mkdir(exist_ok=True)
+            path.write_text(css, encoding='utf-8')
+    except OSError:
+        return None
+
+    version = hashlib.blake2s(css.encode(), digest_size=4).hexdigest()
+    return f"app/static/{name}?v={version}"
+
+
+def head_styles_html(styles, deferred_url: Optional[str] = None,
+                     deferred_id: str = 'botx-responsive-deferred',
+                     extra_js: str = '') -> str:
+    """
+    Script that writes each (id, media, css) into a <style> in the parent <head>
+
+    Elements emitted with st.markdown are removed on the next rerun unless
+    re-sent; styles in the parent <head> persist for the whole browser
+    session, so they only have to be shipped once.
+
+    If deferred_url is given, that stylesheet is loaded after the inline
+    styles. Streamlit serves static .css files as text/plain with nosniff,
+    which browsers refuse for <link rel="stylesheet">, so the file is fetched
+    (HTTP-cached, versioned by ?v=) and its text inserted into the
+    <style id=deferred_id>.
+
+    extra_js is appended to the script as-is.
+    """
+    payload = json.dumps([
+        {"id": style_id, "media": media or "", "css": css}
+        for style_id, media, css in styles
+    ]).replace('</', '<\\/')
+    return f"""
+    <script>
+        const doc = window.parent.document;
+        const ensureStyle = (id) => {{
+            let style = doc.getElementById(id);
+            if (!style) {{
+                style = doc.createElement('style');
+                style.id = id;
+                doc.head.appendChild(style);
+            }}
+            return style;
+        }};
+
+        for (const s of {payload}) {{
+            const style = ensureStyle(s.id);
+            if (s.media) style.media = s.media;
+            style.textContent = s.css;
+        }}
+
+        const deferred = {json.dumps(deferred_url)};
+        const deferredId = {json.dumps(deferred_id)};
+        if (deferred) {{
+            const href = new URL(deferred, window.parent.location.href).href;
+            const current = doc.getElementById(deferredId);
+            if (!current || current.dataset.href !== href) {{
+                fetch(href)
+                    .then(r => r.ok ? r.text() : Promise.reject(r.status))
+                    .then(css => {{
+                        const style = ensureStyle(deferredId);
+                        style.dataset.href = href;
+                        style.textContent = css;
+                    }})
+                    .catch(err => console.warn(deferred + ' not loaded:', err));
+            }}
+        }}
+        {extra_js}
+    </script>
+    """
@@ -3,6 +3,11 @@ Dark Theme CSS with Green Glow
 Reusable dark theme for all pages
 """
 
+from .css_utils import (
+    head_styles_html, minify_css, parse_css, parse_declarations,
+    publish_static_css, serialize_rules
+)
+
 DARK_THEME_CSS = """
 <style>
     /* Dark background - full black */
@@ -239,6 +244,190 @@ DARK_THEME_CSS = """
 """
 
 
+# Login/signup pages: same palette, no sidebar styling, glowing headers
+AUTH_THEME_CSS = """
+<style>
+    /* Dark background - full black */
+    .stApp {
+        background-color: #000000 !important;
+    }
+
+    /* Main content area */
+    .main {
+        background-color: #000000 !important;
+    }
+
+    /* Headers with GREEN GLOW */
+    h1, h2, h3, h4, h5, h6 {
+        color: #00ff41 !important;
+        text-shadow: 0 0 10px #00ff41, 0 0 20px #00ff41, 0 0 30px #00ff41 !important;
+        animation: glow 2s ease-in-out infinite;
+    }
+
+    /* White text for all content */
+    p, .stMarkdown, .stText, label, span, div {
+        color: #ffffff !important;
+    }
+
+    /* Buttons - green neon */
+    .stButton>button {
+        background: linear-gradient(135deg, #003300 0%, #006600 100%) !important;
+        color: #00ff41 !important;
+        border: 2px solid #00ff41 !important;
+        font-weight: bold !important;
+        box-shadow: 0 0 15px rgba(0, 255, 65, 0.3) !important;
+        transition: all 0.3s ease !important;
+    }
+
+    .stButton>button:hover {
+        background: linear-gradient(135deg, #006600 0%, #009900 100%) !important;
+        box-shadow: 0 0 25px rgba(0, 255, 65, 0.6) !important;
+        transform: translateY(-2px);
+    }
+
+    /* Input fields - dark with green border */
+    .stTextInput>div>div>input {
+        background-color: #0a0a0a !important;
+        color: #ffffff !important;
+        border: 1px solid #00ff41 !important;
+        border-radius: 5px !important;
+        box-shadow: 0 0 10px rgba(0, 255, 65, 0.2) !important;
+    }
+
+    .stTextInput>div>div>input:focus {
+        border: 2px solid #00ff41 !important;
+        box-shadow: 0 0 15px rgba(0, 255, 65, 0.4) !important;
+    }
+
+    /* Info boxes - dark with green accent */
+    .stAlert, [data-testid="stNotification"] {
+        background-color: #0a0a0a !important;
+        border: 1px solid #00ff41 !important;
+        color: #ffffff !important;
+        box-shadow: 0 0 10px rgba(0, 255, 65, 0.2) !important;
+    }
+
+    /* Success messages - green glow */
+    .stSuccess {
+        background-color: #001a00 !important;
+        border: 2px solid #00ff41 !important;
+        color: #00ff41 !important;
+        box-shadow: 0 0 15px rgba(0, 255, 65, 0.3) !important;
+    }
+
+    /* Error messages - red glow */
+    .stError {
+        background-color: #1a0000 !important;
+        border: 2px solid #ff0000 !important;
+        color: #ff4444 !important;
+        box-shadow: 0 0 15px rgba(255, 0, 0, 0.3) !important;
+    }
+
+    /* Expander - dark with green */
+    .streamlit-expanderHeader {
+        background-color: #0a0a0a !important;
+        border: 1px solid #00ff41 !important;
+        color: #00ff41 !important;
+    }
+
+    /* Checkbox */
+    .stCheckbox>label {
+        color: #ffffff !important;
+    }
+
+    /* Forms */
+    [data-testid="stForm"] {
+        background-color: #0a0a0a !important;
+        border: 2px solid #00ff41 !important;
+        border-radius: 10px !important;
+        padding: 20px !important;
+        box-shadow: 0 0 20px rgba(0, 255, 65, 0.2) !important;
+    }
+
+    /* Glow animation */
+    @keyframes glow {
+        0%, 100% {
+            text-shadow: 0 0 10px #00ff41, 0 0 20px #00ff41, 0 0 30px #00ff41;
+        }
+        50% {
+            text-shadow: 0 0 15px #00ff41, 0 0 30px #00ff41, 0 0 45px #00ff41;
+        }
+    }
+
+    /* Divider */
+    hr {
+        border-color: #00ff41 !important;
+        opacity: 0.3 !important;
+    }
+</style>
+"""
+
+# The auth stylesheet is shipped once per session into the parent <head>,
+# where it outlives page navigation - scope it to pages carrying the marker
+_AUTH_PAGE_MARKER = '<span class="botx-auth-page"></span>'
+_AUTH_SCOPE = '.stApp:has(.botx-auth-page)'
+
+
+def _scope_rules(rules, scope: str) -> list:
+    """Prefix every selector in rules with scope (keyframe steps are left alone)"""
+    scoped = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            if not prelude.startswith('@keyframes'):
+                body = _scope_rules(body, scope)
+            else:
+                body = [(step, parse_declarations(decls)) for step, decls in body]
+        else:
+            prelude = ','.join(
+                scope if sel == '.stApp' else f"{scope} {sel}"
+                for sel in prelude.split(',')
+            )
+            body = parse_declarations(body)
+        scoped.append((prelude, body))
+    return scoped
+
+
+_AUTH_THEME_RULES = _scope_rules(
+    parse_css(minify_css(AUTH_THEME_CSS.replace('<style>', '').replace('</style>', '')))[0],
+    _AUTH_SCOPE,
+)
+_AUTH_THEME_SCOPED = serialize_rules(_AUTH_THEME_RULES)
+
+# Black backgrounds go inline (no white flash); the rest is published as
+# static/theme_dark.css so the browser caches it across sessions
+_AUTH_CRITICAL_PRELUDES = (_AUTH_SCOPE, f"{_AUTH_SCOPE} .main")
+_AUTH_THEME_CRITICAL = serialize_rules(
+    [rule for rule in _AUTH_THEME_RULES if rule[0] in _AUTH_CRITICAL_PRELUDES]
+)
+_AUTH_THEME_DEFERRED = serialize_rules(
+    [rule for rule in _AUTH_THEME_RULES if rule[0] not in _AUTH_CRITICAL_PRELUDES]
+)
+_AUTH_STATIC_CSS_NAME = "theme_dark.css"
+
+
+def apply_auth_theme():
+    """Apply AUTH_THEME_CSS to the current login/signup page (shipped once per session)"""
+    import streamlit as st
+    import streamlit.components.v1 as components
+
+    # Tiny per-rerun marker that switches the scoped stylesheet on
+    st.markdown(_AUTH_PAGE_MARKER, unsafe_allow_html=True)
+
+    if st.session_state.get('_auth_css_injected'):
+        return
+
+    url = publish_static_css(_AUTH_STATIC_CSS_NAME, _AUTH_THEME_DEFERRED)
+    if url:
+        html = head_styles_html([('botx-auth-theme', '', _AUTH_THEME_CRITICAL)],
+                                deferred_url=url, deferred_id='botx-auth-theme-deferred')
+    else:
+        # Read-only deploy without the static file: ship everything inline
+        html = head_styles_html([('botx-auth-theme', '', _AUTH_THEME_SCOPED)])
+
+    components.html(html, height=0)
+    st.session_state['_auth_css_injected'] = True
+
+
 def apply_dark_theme():
     """Apply the dark theme to the current page"""
     import streamlit as st
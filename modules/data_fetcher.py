@@ -11,6 +11,8 @@ import asyncio
 import httpx
 import time
 
+from .indicators_nb import NUMBA_AVAILABLE, INDICATOR_COLUMNS, compute_all
+
 
 class DataFetcher:
     """
@@ -39,7 +41,8 @@ class DataFetcher:
         interval: str,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
-        limit: int = 1500
+        limit: int = 1500,
+        client: Optional[httpx.AsyncClient] = None
     ) -> pd.DataFrame:
         """
         Fetch historical klines (OHLCV data)
@@ -50,10 +53,15 @@ class DataFetcher:
             start_time: Start datetime (default: 30 days ago)
             end_time: End datetime (default: now)
             limit: Max candles per request (max 1500)
+            client: Shared HTTP client (default: a new one for this call)
 
         Returns:
             DataFrame with OHLCV data
         """
+        if client is None:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                return await self.fetch_klines(symbol, interval, start_time, end_time, limit, client)
+
         # Default time range: last 30 days
         if end_time is None:
             end_time = datetime.utcnow()
@@ -68,49 +76,48 @@ class DataFetcher:
         all_klines = []
         current_start = start_ms
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            while current_start < end_ms:
-                # API parameters
-                params = {
-                    'symbol': symbol,
-                    'interval': interval,
-                    'startTime': current_start,
-                    'endTime': end_ms,
-                    'limit': limit
-                }
-
-                try:
-                    # Fetch data
-                    response = await client.get(
-                        f"{self.base_url}/fapi/v1/klines",
-                        params=params
-                    )
-                    response.raise_for_status()
-
-                    klines = response.json()
-
-                    if not klines:
-                        break
-
-                    all_klines.extend(klines)
-
-                    # Update start time for next batch
-                    current_start = klines[-1][6] + 1  # Close time + 1ms
-
-                    # Rate limiting (1200 requests/minute = 50ms between requests)
-                    await asyncio.sleep(0.05)
-
-                except httpx.HTTPError as e:
-                    print(f"Error fetching klines: {e}")
-                    print(f"URL: {self.base_url}/fapi/v1/klines")
-                    print(f"Params: {params}")
-                    break
-                except Exception as e:
-                    print(f"Unexpected error fetching klines: {e}")
-                    import traceback
-                    traceback.print_exc()
+        while current_start < end_ms:
+            # API parameters
+            params = {
+                'symbol': symbol,
+                'interval': interval,
+                'startTime': current_start,
+                'endTime': end_ms,
+                'limit': limit
+            }
+
+            try:
+                # Fetch data
+                response = await client.get(
+                    f"{self.base_url}/fapi/v1/klines",
+                    params=params
+                )
+                response.raise_for_status()
+
+                klines = response.json()
+
+                if not klines:
                     break
 
+                all_klines.extend(klines)
+
+                # Update start time for next batch
+                current_start = klines[-1][6] + 1  # Close time + 1ms
+
+                # Rate limiting (1200 requests/minute = 50ms between requests)
+                await asyncio.sleep(0.05)
+
+            except httpx.HTTPError as e:
+                print(f"Error fetching klines: {e}")
+                print(f"URL: {self.base_url}/fapi/v1/klines")
+                print(f"Params: {params}")
+                break
+            except Exception as e:
+                print(f"Unexpected error fetching klines: {e}")
+                import traceback
+                traceback.print_exc()
+                break
+
         # Convert to DataFrame
         if not all_klines:
             return pd.DataFrame()
@@ -222,6 +229,15 @@ class DataFetcher:
         """
         df = df.copy()
 
+        # Fused compiled pass when numba is installed (same columns and values)
+        if NUMBA_AVAILABLE and len(df) > 0:
+            arrays = [np.ascontiguousarray(df[col], dtype=np.float64)
+                      for col in ('close', 'high', 'low', 'volume')]
+            if not any(np.isnan(a).any() for a in arrays):
+                for name, values in zip(INDICATOR_COLUMNS, compute_all(*arrays)):
+                    df[name] = values
+                return df
+
         # EMAs
         df['ema_8'] = df['close'].ewm(span=8, adjust=False).mean()
         df['ema_21'] = df['close'].ewm(span=21, adjust=False).mean()
@@ -0,0 +1,121 @@
+"""
+Compiled Indicator Kernels
+Numba versions of DataFetcher.calculate_indicators (optional dependency)
+"""
+
+import numpy as np
+
+# Optional: numba compiles the kernels; without it DataFetcher keeps the
+# pandas implementation
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Order of the arrays returned by compute_all (= calculate_indicators columns)
+INDICATOR_COLUMNS = (
+    'ema_8', 'ema_21', 'ema_50', 'ema_200', 'rsi', 'atr', 'volume_ma',
+    'bb_middle', 'bb_std', 'bb_upper', 'bb_lower',
+)
+
+# error_model='numpy': x/0 gives inf/nan like pandas instead of raising.
+# No fastmath - the warm-up NaNs have to survive.
+_JIT = dict(cache=True, error_model='numpy')
+
+
+@njit(**_JIT)
+def _ema(x, span, out):
+    """ewm(span, adjust=False).mean()"""
+    alpha = 2.0 / (span + 1.0)
+    out[0] = x[0]
+    for i in range(1, x.shape[0]):
+        out[i] = alpha * x[i] + (1.0 - alpha) * out[i - 1]
+
+
+@njit(**_JIT)
+def _rolling_mean(x, window, out):
+    """rolling(window).mean() - NaN until the window is full"""
+    for i in range(x.shape[0]):
+        if i < window - 1:
+            out[i] = np.nan
+            continue
+        total = 0.0
+        for j in range(i - window + 1, i + 1):
+            total += x[j]
+        out[i] = total / window
+
+
+@njit(**_JIT)
+def _rolling_std(x, window, mean, out):
+    """rolling(window).std() (ddof=1) given the rolling mean"""
+    for i in range(x.shape[0]):
+        if i < window - 1:
+            out[i] = np.nan
+            continue
+        total = 0.0
+        for j in range(i - window + 1, i + 1):
+            d = x[j] - mean[i]
+            total += d * d
+        out[i] = np.sqrt(total / (window - 1))
+
+
+@njit(**_JIT)
+def compute_all(close, high, low, volume):
+    """
+    All calculate_indicators columns for NaN-free, non-empty float64 input
+
+    Returns:
+        Tuple of arrays in INDICATOR_COLUMNS order
+    """
+    n = close.shape[0]
+
+    ema_8 = np.empty(n)
+    ema_21 = np.empty(n)
+    ema_50 = np.empty(n)
+    ema_200 = np.empty(n)
+    _ema(close, 8, ema_8)
+    _ema(close, 21, ema_21)
+    _ema(close, 50, ema_50)
+    _ema(close, 200, ema_200)
+
+    # RSI (simple 14-bar averages) and true range in one pass
+    gain = np.zeros(n)
+    loss = np.zeros(n)
+    tr = np.empty(n)
+    tr[0] = high[0] - low[0]
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            gain[i] = delta
+        elif delta < 0:
+            loss[i] = -delta
+        tr[i] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+
+    avg_gain = np.empty(n)
+    avg_loss = np.empty(n)
+    _rolling_mean(gain, 14, avg_gain)
+    _rolling_mean(loss, 14, avg_loss)
+    rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    atr = np.empty(n)
+    _rolling_mean(tr, 14, atr)
+
+    volume_ma = np.empty(n)
+    _rolling_mean(volume, 20, volume_ma)
+
+    # Bollinger Bands
+    bb_middle = np.empty(n)
+    bb_std = np.empty(n)
+    _rolling_mean(close, 20, bb_middle)
+    _rolling_std(close, 20, bb_middle, bb_std)
+    bb_upper = bb_middle + bb_std * 2
+    bb_lower = bb_middle - bb_std * 2
+
+    return (ema_8, ema_21, ema_50, ema_200, rsi, atr, volume_ma,
+            bb_middle, bb_std, bb_upper, bb_lower)
@@ -7,13 +7,135 @@ import hashlib
 import secrets
 import hmac
 import json
+import re
 import sqlite3
-from datetime import datetime, timedelta
-from typing import Optional, Tuple, Dict
+import threading
+import time
+import calendar
+from datetime import datetime, timedelta, timezone
+from functools import cache, cached_property, lru_cache
+from typing import Optional, Tuple, Dict, Iterable, List
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import uuid
 
+
+# Tier-based license key prefixes
+TIER_PREFIXES = {
+    'free': 'FREE',
+    'pro': 'PRO',
+    'premium': 'PREM',
+    'enterprise': 'ENT'
+}
+
+# Fixed durations (days) - other tiers use the requested duration
+TIER_DURATIONS = {
+    'free': 365,  # Free tier - 1 year (renewable)
+}
+
+# Tier ordering for upgrade checks
+TIER_RANK = {'free': 0, 'pro': 1, 'premium': 2, 'enterprise': 3}
+
+
+# Checksum scheme for newly issued keys
+# 1 = HMAC-SHA256 truncated to 4 hex chars (legacy, still accepted)
+# 2 = keyed BLAKE2s with a 2-byte digest
+CHECKSUM_VERSION = 2
+
+
+# PREFIX-XXXX-XXXX-XXXX-XXXX-CCCC (4 random hex groups + checksum)
+_KEY_RE = re.compile(r'[A-Za-z0-9]{1,16}(?:-[0-9A-F]{4}){5}')
+
+
+@lru_cache(maxsize=1024)
+def _checksum(mac_key: bytes, key: str) -> bytes:
+    """Keyed BLAKE2s checksum of a license key (uppercase hex, ASCII bytes)"""
+    return hashlib.blake2s(key.encode(), key=mac_key, digest_size=2).hexdigest().upper().encode()
+
+
+@lru_cache(maxsize=1024)
+def _legacy_checksum(secret: bytes, key: str) -> bytes:
+    """v1 HMAC checksum, kept so keys issued before v2 still validate"""
+    return hmac.new(secret, key.encode(), hashlib.sha256).hexdigest()[:4].upper().encode()
+
+
+@cache
+def _machine_hardware_id() -> str:
+    """Hardware ID for this machine - invariant for the process lifetime"""
+    import platform
+    import socket
+
+    try:
+        # Get MAC address. The shifts step by 2 bits (not 8) - a historical
+        # quirk kept as-is because existing activations are bound to the
+        # resulting hardware ID.
+        node = uuid.getnode()
+        mac = ':'.join(f"{(node >> shift) & 0xff:02x}" for shift in range(10, -1, -2))
+
+        # Get hostname
+        hostname = socket.gethostname()
+
+        # Combine and hash
+        combined = f"{mac}-{hostname}-{platform.machine()}"
+        hardware_id = hashlib.sha256(combined.encode()).hexdigest()[:16].upper()
+
+        return hardware_id
+    except:
+        # Fallback to random UUID
+        return str(uuid.uuid4()).replace('-', '')[:16].upper()
+
+
+def _to_epoch(dt: datetime) -> int:
+    """Naive UTC datetime -> unix seconds"""
+    return calendar.timegm(dt.utctimetuple())
+
+
+def _from_epoch(ts: int) -> datetime:
+    """Unix seconds -> naive UTC datetime"""
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+
+# Dates are stored as INTEGER unix seconds (UTC)
+_LICENSES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        license_key TEXT PRIMARY KEY,
+        tier TEXT NOT NULL,
+        user_id TEXT NOT NULL,
+        email TEXT NOT NULL,
+        issued_date INTEGER NOT NULL,
+        expiry_date INTEGER NOT NULL,
+        hardware_id TEXT,
+        is_active INTEGER DEFAULT 1,
+        max_activations INTEGER DEFAULT 1,
+        activation_count INTEGER DEFAULT 0,
+        metadata TEXT DEFAULT '{{}}'
+    )
+"""
+
+# Full-row fetch used when a complete License object is needed
+_SELECT_LICENSES_SQL = """
+    SELECT license_key, tier, user_id, email, issued_date, expiry_date,
+           hardware_id, is_active, max_activations, activation_count, metadata
+    FROM licenses
+"""
+
+_SAVE_LICENSE_SQL = """
+    INSERT OR REPLACE INTO licenses
+    (license_key, tier, user_id, email, issued_date, expiry_date,
+     hardware_id, is_active, max_activations, activation_count, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Max keys per IN (...) query - stays well under SQLite's variable limit
+_BULK_CHUNK_SIZE = 500
+
+# Narrow fetch for the validation hot path (skips metadata / issued_date)
+_VALIDATE_LICENSE_SQL = """
+    SELECT is_active, expiry_date, hardware_id, tier
+    FROM licenses WHERE license_key = ?
+"""
+
+
 @dataclass
 class License:
     """License data structure"""
@@ -27,22 +149,34 @@ class License:
     is_active: bool = True
     max_activations: int = 1
     activation_count: int = 0
-    metadata: Dict = None
+    _metadata_raw: str = '{}'  # JSON as stored; decoded lazily via .metadata
+
+    def __post_init__(self):
+        # Tiers are always lowercase from here on
+        self.tier = self.tier.lower()
+
+    @cached_property
+    def metadata(self) -> Dict:
+        """Metadata dict, decoded from JSON on first access"""
+        return json.loads(self._metadata_raw or '{}')
 
     def to_dict(self):
         """Convert to dictionary for storage"""
         data = asdict(self)
-        data['issued_date'] = self.issued_date.isoformat()
-        data['expiry_date'] = self.expiry_date.isoformat()
-        data['metadata'] = json.dumps(self.metadata or {})
+        data['issued_date'] = _to_epoch(self.issued_date)
+        data['expiry_date'] = _to_epoch(self.expiry_date)
+
+        # Re-encode only if the metadata was decoded (and possibly modified)
+        raw = data.pop('_metadata_raw')
+        data['metadata'] = json.dumps(self.__dict__['metadata']) if 'metadata' in self.__dict__ else raw
         return data
 
     @staticmethod
     def from_dict(data: dict):
         """Create License from dictionary"""
-        data['issued_date'] = datetime.fromisoformat(data['issued_date'])
-        data['expiry_date'] = datetime.fromisoformat(data['expiry_date'])
-        data['metadata'] = json.loads(data.get('metadata', '{}'))
+        data['issued_date'] = _from_epoch(data['issued_date'])
+        data['expiry_date'] = _from_epoch(data['expiry_date'])
+        data['_metadata_raw'] = data.pop('metadata', None) or '{}'
         return License(**data)
 
 
@@ -71,29 +205,31 @@ class LicenseManager:
 
         # Secret key for signing - CHANGE THIS IN PRODUCTION
         self.secret_key = secret_key or "CHANGE_THIS_SECRET_KEY_IN_PRODUCTION"
+        self._secret_bytes = self.secret_key.encode()
+        # BLAKE2s keys are capped at 32 bytes, so derive a fixed-size MAC key
+        self._mac_key = hashlib.blake2s(self._secret_bytes).digest()
+
+        # One SQLite connection per thread (the manager is a shared singleton)
+        self._local = threading.local()
 
         self._init_database()
 
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's database connection (opened on first use)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
     def _init_database(self):
         """Initialize SQLite database"""
-        conn = sqlite3.connect(str(self.db_path))
+        conn = self._conn()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS licenses (
-                license_key TEXT PRIMARY KEY,
-                tier TEXT NOT NULL,
-                user_id TEXT NOT NULL,
-                email TEXT NOT NULL,
-                issued_date TEXT NOT NULL,
-                expiry_date TEXT NOT NULL,
-                hardware_id TEXT,
-                is_active INTEGER DEFAULT 1,
-                max_activations INTEGER DEFAULT 1,
-                activation_count INTEGER DEFAULT 0,
-                metadata TEXT DEFAULT '{}'
-            )
-        """)
+        cursor.execute(_LICENSES_TABLE_SQL.format(table='licenses'))
+        self._migrate_date_columns(cursor)
 
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS activations (
@@ -117,8 +253,46 @@ class LicenseManager:
             ON licenses(email)
         """)
 
+        # Case-insensitive email lookups
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_license_email_lower
+            ON licenses(lower(email))
+        """)
+
+        # Covers the (license_key, hardware_id) lookup in _update_last_seen
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_activations_key_hw
+            ON activations(license_key, hardware_id)
+        """)
+
         conn.commit()
-        conn.close()
+
+        # Refresh planner statistics so the new indexes are picked up
+        cursor.execute("ANALYZE")
+
+    def _migrate_date_columns(self, cursor):
+        """
+        One-time migration of ISO-8601 TEXT dates to INTEGER unix seconds
+
+        Databases created before dates were stored as integers are rebuilt
+        in place; new databases are left untouched.
+        """
+        columns = {row['name']: row['type'] for row in cursor.execute("PRAGMA table_info(licenses)")}
+        if columns.get('expiry_date', '').upper() != 'TEXT':
+            return
+
+        cursor.execute(_LICENSES_TABLE_SQL.format(table='licenses_new'))
+        cursor.execute("""
+            INSERT INTO licenses_new
+            SELECT license_key, tier, user_id, email,
+                   CAST(strftime('%s', issued_date) AS INTEGER),
+                   CAST(strftime('%s', expiry_date) AS INTEGER),
+                   hardware_id, is_active, max_activations, activation_count, metadata
+            FROM licenses
+        """)
+        cursor.execute("DROP TABLE licenses")
+        cursor.execute("ALTER TABLE licenses_new RENAME TO licenses")
+        cursor.connection.commit()
 
     def generate_license_key(self, tier: str, prefix: str = None) -> str:
         """
@@ -133,21 +307,11 @@ class LicenseManager:
         Returns:
             Formatted license key
         """
-        # Tier-based prefix
-        tier_prefixes = {
-            'free': 'FREE',
-            'pro': 'PRO',
-            'premium': 'PREM',
-            'enterprise': 'ENT'
-        }
+        prefix = prefix or TIER_PREFIXES.get(tier.lower(), 'BOT')
 
-        prefix = prefix or tier_prefixes.get(tier.lower(), 'BOT')
-
-        # Generate random segments
-        segments = []
-        for _ in range(4):
-            segment = secrets.token_hex(2).upper()  # 4 chars
-            segments.append(segment)
+        # Generate random segments - one RNG draw, sliced into 4-char groups
+        raw = secrets.token_bytes(8).hex().upper()
+        segments = [raw[i:i + 4] for i in range(0, 16, 4)]
 
         license_key = f"{prefix}-{'-'.join(segments)}"
 
@@ -157,29 +321,27 @@ class LicenseManager:
         return f"{license_key}-{checksum}"
 
     def _calculate_checksum(self, license_key: str) -> str:
-        """Calculate HMAC checksum for license key"""
-        signature = hmac.new(
-            self.secret_key.encode(),
-            license_key.encode(),
-            hashlib.sha256
-        ).hexdigest()[:4].upper()
-        return signature
+        """Calculate checksum for license key"""
+        return _checksum(self._mac_key, license_key).decode()
 
     def validate_checksum(self, license_key: str) -> bool:
         """Validate license key checksum"""
-        if '-' not in license_key:
+        # Cheap format prefilter - malformed input never reaches the MAC
+        if not isinstance(license_key, str) or not _KEY_RE.fullmatch(license_key):
             return False
 
-        parts = license_key.split('-')
-        if len(parts) < 2:
-            return False
+        key_without_checksum, checksum = license_key.rsplit('-', 1)
 
-        checksum = parts[-1]
-        key_without_checksum = '-'.join(parts[:-1])
+        # Compare as bytes - the cached checksums are already bytes
+        checksum = checksum.encode()
 
-        expected_checksum = self._calculate_checksum(key_without_checksum)
+        expected_checksum = _checksum(self._mac_key, key_without_checksum)
+        if hmac.compare_digest(checksum, expected_checksum):
+            return True
 
-        return hmac.compare_digest(checksum, expected_checksum)
+        # Keys issued before CHECKSUM_VERSION 2
+        legacy_checksum = _legacy_checksum(self._secret_bytes, key_without_checksum)
+        return hmac.compare_digest(checksum, legacy_checksum)
 
     def create_license(
         self,
@@ -204,52 +366,58 @@ class LicenseManager:
         Returns:
             License object
         """
-        user_id = user_id or str(uuid.uuid4())
-        license_key = self.generate_license_key(tier)
-
-        issued_date = datetime.utcnow()
-
-        # Tier-based durations
-        tier_durations = {
-            'free': 365,  # Free tier - 1 year (renewable)
-            'pro': duration_days,
-            'premium': duration_days,
-            'enterprise': duration_days
-        }
-
-        expiry_date = issued_date + timedelta(days=tier_durations.get(tier.lower(), duration_days))
-
-        license = License(
-            license_key=license_key,
-            tier=tier.lower(),
-            user_id=user_id,
-            email=email,
-            issued_date=issued_date,
-            expiry_date=expiry_date,
-            is_active=True,
-            max_activations=max_activations,
-            activation_count=0,
-            metadata=metadata or {}
-        )
-
-        # Save to database
-        self._save_license(license)
+        return self.create_licenses_bulk([{
+            'tier': tier,
+            'email': email,
+            'duration_days': duration_days,
+            'user_id': user_id,
+            'max_activations': max_activations,
+            'metadata': metadata
+        }])[0]
+
+    def create_licenses_bulk(self, specs: List[dict]) -> List[License]:
+        """
+        Create many licenses in a single transaction
 
-        return license
+        Args:
+            specs: One dict per license with create_license's keyword
+                arguments (tier and email required)
 
-    def _save_license(self, license: License):
-        """Save license to database"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
+        Returns:
+            List of License objects, in the same order as specs
+        """
+        issued_date = datetime.utcnow()
+        licenses = []
+
+        for spec in specs:
+            tier = spec['tier'].lower()
+            duration_days = spec.get('duration_days', 30)
+
+            licenses.append(License(
+                license_key=self.generate_license_key(tier),
+                tier=tier,
+                user_id=spec.get('user_id') or str(uuid.uuid4()),
+                email=spec['email'],
+                issued_date=issued_date,
+                expiry_date=issued_date + timedelta(days=TIER_DURATIONS.get(tier, duration_days)),
+                is_active=True,
+                max_activations=spec.get('max_activations', 1),
+                activation_count=0,
+                _metadata_raw=json.dumps(spec.get('metadata') or {})
+            ))
+
+        # Save to database - one executemany, one commit
+        conn = self._conn()
+        with conn:
+            conn.executemany(_SAVE_LICENSE_SQL, [self._license_params(lic) for lic in licenses])
+
+        return licenses
 
+    @staticmethod
+    def _license_params(license: License) -> tuple:
+        """Positional parameters for _SAVE_LICENSE_SQL"""
         data = license.to_dict()
-
-        cursor.execute("""
-            INSERT OR REPLACE INTO licenses
-            (license_key, tier, user_id, email, issued_date, expiry_date,
-             hardware_id, is_active, max_activations, activation_count, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        return (
             data['license_key'],
             data['tier'],
             data['user_id'],
@@ -261,36 +429,56 @@ class LicenseManager:
             data['max_activations'],
             data['activation_count'],
             data['metadata']
-        ))
+        )
 
-        conn.commit()
-        conn.close()
+    def _save_license(self, license: License):
+        """Save license to database"""
+        conn = self._conn()
+        with conn:
+            conn.execute(_SAVE_LICENSE_SQL, self._license_params(license))
+
+    @staticmethod
+    def _row_to_license(row: sqlite3.Row) -> License:
+        """Build a License from a full licenses row"""
+        data = dict(row)
+        data['is_active'] = bool(data['is_active'])
+        return License.from_dict(data)
 
     def get_license(self, license_key: str) -> Optional[License]:
         """Retrieve license from database"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
+        return self.get_licenses([license_key]).get(license_key)
 
-        cursor.execute("""
-            SELECT * FROM licenses WHERE license_key = ?
-        """, (license_key,))
+    def get_licenses(self, license_keys: Iterable[str]) -> Dict[str, License]:
+        """
+        Retrieve many licenses at once
 
-        row = cursor.fetchone()
-        conn.close()
+        Runs one IN (...) query per chunk of keys instead of one query per key.
 
-        if not row:
-            return None
+        Returns:
+            {license_key: License} for every key found
+        """
+        keys = list(dict.fromkeys(license_keys))
+        licenses = {}
 
-        columns = [
-            'license_key', 'tier', 'user_id', 'email', 'issued_date',
-            'expiry_date', 'hardware_id', 'is_active', 'max_activations',
-            'activation_count', 'metadata'
-        ]
+        for start in range(0, len(keys), _BULK_CHUNK_SIZE):
+            chunk = keys[start:start + _BULK_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn().execute(
+                f"{_SELECT_LICENSES_SQL} WHERE license_key IN ({placeholders})", chunk
+            ).fetchall()
 
-        data = dict(zip(columns, row))
-        data['is_active'] = bool(data['is_active'])
+            for row in rows:
+                licenses[row['license_key']] = self._row_to_license(row)
 
-        return License.from_dict(data)
+        return licenses
+
+    def get_licenses_by_email(self, email: str) -> list:
+        """Retrieve all licenses for an email (case-insensitive)"""
+        rows = self._conn().execute(
+            f"{_SELECT_LICENSES_SQL} WHERE lower(email) = lower(?)", (email,)
+        ).fetchall()
+
+        return [self._row_to_license(row) for row in rows]
 
     def activate_license(
         self,
@@ -354,57 +542,31 @@ class LicenseManager:
 
         Uses: MAC address, hostname, UUID
         """
-        import platform
-        import socket
-
-        try:
-            # Get MAC address
-            mac = ':'.join(['{:02x}'.format((uuid.getnode() >> elements) & 0xff)
-                           for elements in range(0, 2*6, 2)][::-1])
-
-            # Get hostname
-            hostname = socket.gethostname()
-
-            # Combine and hash
-            combined = f"{mac}-{hostname}-{platform.machine()}"
-            hardware_id = hashlib.sha256(combined.encode()).hexdigest()[:16].upper()
-
-            return hardware_id
-        except:
-            # Fallback to random UUID
-            return str(uuid.uuid4()).replace('-', '')[:16].upper()
+        return _machine_hardware_id()
 
     def _record_activation(self, license_key: str, hardware_id: str, ip_address: str = None):
         """Record activation in database"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
         now = datetime.utcnow().isoformat()
 
-        cursor.execute("""
-            INSERT INTO activations
-            (license_key, hardware_id, activated_at, last_seen, ip_address)
-            VALUES (?, ?, ?, ?, ?)
-        """, (license_key, hardware_id, now, now, ip_address))
-
-        conn.commit()
-        conn.close()
+        conn = self._conn()
+        with conn:
+            conn.execute("""
+                INSERT INTO activations
+                (license_key, hardware_id, activated_at, last_seen, ip_address)
+                VALUES (?, ?, ?, ?, ?)
+            """, (license_key, hardware_id, now, now, ip_address))
 
     def _update_last_seen(self, license_key: str, hardware_id: str):
         """Update last seen timestamp"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
         now = datetime.utcnow().isoformat()
 
-        cursor.execute("""
-            UPDATE activations
-            SET last_seen = ?
-            WHERE license_key = ? AND hardware_id = ?
-        """, (now, license_key, hardware_id))
-
-        conn.commit()
-        conn.close()
+        conn = self._conn()
+        with conn:
+            conn.execute("""
+                UPDATE activations
+                SET last_seen = ?
+                WHERE license_key = ? AND hardware_id = ?
+            """, (now, license_key, hardware_id))
 
     def validate_license(
         self,
@@ -421,28 +583,28 @@ class LicenseManager:
         if not self.validate_checksum(license_key):
             return False, "Invalid license key format", None
 
-        # Get license
-        license = self.get_license(license_key)
-        if not license:
+        # Only the columns needed for validation - no full License object
+        row = self._conn().execute(_VALIDATE_LICENSE_SQL, (license_key,)).fetchone()
+        if not row:
             return False, "License key not found", None
 
         # Check if active
-        if not license.is_active:
+        if not row['is_active']:
             return False, "License is deactivated", None
 
-        # Check expiry
-        if datetime.utcnow() > license.expiry_date:
+        # Check expiry (integer unix seconds - no datetime parsing)
+        if int(time.time()) > row['expiry_date']:
             return False, "License has expired", None
 
         # Check hardware binding
         if hardware_id:
-            if not license.hardware_id:
+            if not row['hardware_id']:
                 return False, "License not activated on any device", None
 
-            if license.hardware_id != hardware_id:
+            if row['hardware_id'] != hardware_id:
                 return False, "License activated on different device", None
 
-        return True, "License is valid", license.tier
+        return True, "License is valid", row['tier']
 
     def deactivate_license(self, license_key: str) -> Tuple[bool, str]:
         """Deactivate a license"""
@@ -472,12 +634,11 @@ class LicenseManager:
         if not license:
             return False, "License not found"
 
-        tier_hierarchy = ['free', 'pro', 'premium', 'enterprise']
-
-        if tier_hierarchy.index(new_tier.lower()) <= tier_hierarchy.index(license.tier):
+        tier = new_tier.lower()
+        if TIER_RANK[tier] <= TIER_RANK[license.tier]:
             return False, "Cannot downgrade or maintain same tier"
 
-        license.tier = new_tier.lower()
+        license.tier = tier
         self._save_license(license)
 
         return True, f"License upgraded to {new_tier}"
@@ -488,7 +649,8 @@ class LicenseManager:
         if not license:
             return None
 
-        days_remaining = (license.expiry_date - datetime.utcnow()).days
+        now = datetime.utcnow()
+        days_remaining = (license.expiry_date - now).days
 
         return {
             'license_key': license.license_key,
@@ -498,7 +660,7 @@ class LicenseManager:
             'issued_date': license.issued_date.strftime('%Y-%m-%d'),
             'expiry_date': license.expiry_date.strftime('%Y-%m-%d'),
             'days_remaining': max(0, days_remaining),
-            'is_expired': datetime.utcnow() > license.expiry_date,
+            'is_expired': now > license.expiry_date,
             'activation_count': license.activation_count,
             'max_activations': license.max_activations,
             'hardware_id': license.hardware_id[:8] + '...' if license.hardware_id else None,
@@ -3,13 +3,37 @@ License State Manager
 Manages local license state and validation
 """
 
+import os
 import json
+import time
 import hashlib
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Tuple
 from .license_manager import LicenseManager
 
+# Pretty-print the state file only when debugging
+_PRETTY_STATE = os.getenv('APP_DEBUG') == '1'
+
+# Prefer orjson (faster, emits bytes directly); fall back to stdlib json
+try:
+    import orjson
+
+    _DUMPS_OPTIONS = orjson.OPT_SORT_KEYS | (orjson.OPT_INDENT_2 if _PRETTY_STATE else 0)
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=_DUMPS_OPTIONS)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True, indent=2 if _PRETTY_STATE else None).encode()
+
+    _loads = json.loads
+
+# Re-validate against the license database at most this often
+_VALIDATION_INTERVAL_SECONDS = 24 * 3600
+
 
 class LicenseState:
     """
@@ -30,8 +54,12 @@ class LicenseState:
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
 
         self.license_manager = LicenseManager()
+        self._last_serialized = None
         self.state = self._load_state()
 
+        # In-memory time of the last real validation (monotonic clock)
+        self._last_check_mono = 0.0
+
     def _load_state(self) -> dict:
         """Load state from file"""
         if not self.state_file.exists():
@@ -45,8 +73,9 @@ class LicenseState:
             }
 
         try:
-            with open(self.state_file, 'r') as f:
-                return json.load(f)
+            state = _loads(self.state_file.read_bytes())
+            self._last_serialized = self._serialize(state)
+            return state
         except:
             return {
                 'license_key': None,
@@ -57,10 +86,22 @@ class LicenseState:
                 'is_valid': False
             }
 
+    @staticmethod
+    def _serialize(state: dict) -> bytes:
+        """Serialize state deterministically for change detection"""
+        return _dumps(state)
+
     def _save_state(self):
-        """Save state to file"""
-        with open(self.state_file, 'w') as f:
-            json.dump(self.state, f, indent=2)
+        """Save state to file (skipped when unchanged, atomic replace otherwise)"""
+        serialized = self._serialize(self.state)
+        if serialized == self._last_serialized:
+            return
+
+        tmp_file = self.state_file.with_suffix('.tmp')
+        tmp_file.write_bytes(serialized)
+        os.replace(tmp_file, self.state_file)
+
+        self._last_serialized = serialized
 
     def activate(self, license_key: str) -> Tuple[bool, str]:
         """
@@ -85,6 +126,7 @@ class LicenseState:
         self.state['activated_at'] = datetime.utcnow().isoformat()
         self.state['last_validated'] = datetime.utcnow().isoformat()
         self.state['is_valid'] = True
+        self._last_check_mono = time.monotonic()
 
         self._save_state()
 
@@ -104,19 +146,24 @@ class LicenseState:
         if not self.state.get('license_key'):
             return False, "No license activated. Running in FREE tier mode.", 'free'
 
-        # Check if validation is needed
-        last_validated = self.state.get('last_validated')
-        if not force_check and last_validated:
-            try:
-                last_check = datetime.fromisoformat(last_validated)
-                hours_since_check = (datetime.utcnow() - last_check).seconds / 3600
-
-                # Only validate every 24 hours
-                if hours_since_check < 24:
-                    if self.state.get('is_valid'):
+        if not force_check and self.state.get('is_valid'):
+            # Fast path: validated earlier in this process
+            if self._last_check_mono:
+                if time.monotonic() - self._last_check_mono < _VALIDATION_INTERVAL_SECONDS:
+                    return True, "License valid (cached)", self.state.get('tier', 'free')
+
+            # Cold path (e.g. after restart): fall back to the persisted timestamp
+            elif self.state.get('last_validated'):
+                try:
+                    last_check = datetime.fromisoformat(self.state['last_validated'])
+                    seconds_since_check = (datetime.utcnow() - last_check).total_seconds()
+
+                    # Only validate every 24 hours
+                    if seconds_since_check < _VALIDATION_INTERVAL_SECONDS:
+                        self._last_check_mono = time.monotonic() - seconds_since_check
                         return True, "License valid (cached)", self.state.get('tier', 'free')
-            except:
-                pass
+                except:
+                    pass
 
         # Validate with license manager
         license_key = self.state['license_key']
@@ -131,6 +178,7 @@ class LicenseState:
         self.state['is_valid'] = is_valid
         self.state['tier'] = tier or 'free'
         self.state['last_validated'] = datetime.utcnow().isoformat()
+        self._last_check_mono = time.monotonic()
 
         self._save_state()
 
@@ -155,6 +203,7 @@ class LicenseState:
             'last_validated': None,
             'is_valid': False
         }
+        self._last_check_mono = 0.0
 
         self._save_state()
 
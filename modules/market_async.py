@@ -0,0 +1,84 @@
+"""
+Async Market Scanner
+Fetch live data for several pairs concurrently
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence
+
+import httpx
+import pandas as pd
+
+from .data_fetcher import DataFetcher
+
+
+async def fetch_klines(
+    client: httpx.AsyncClient,
+    fetcher: DataFetcher,
+    symbol: str,
+    interval: str,
+    hours: int = 24,
+    limit: int = 500
+) -> Optional[pd.DataFrame]:
+    """
+    Fetch recent klines for one pair and add indicators
+
+    Args:
+        client: Shared HTTP client
+        fetcher: DataFetcher (picks testnet/production)
+        symbol: Trading pair
+        interval: Timeframe
+        hours: How far back to fetch
+        limit: Max candles per request
+
+    Returns:
+        DataFrame with indicators, or None if nothing could be fetched
+    """
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(hours=hours)
+
+    try:
+        df = await fetcher.fetch_klines(symbol, interval, start_time, end_time, limit, client)
+        if df.empty:
+            return None
+        return fetcher.calculate_indicators(df)
+    except Exception as e:
+        print(f"Error scanning {symbol}: {e}")
+        return None
+
+
+async def scan_all(
+    fetcher: DataFetcher,
+    pairs: Sequence[str],
+    interval: str,
+    hours: int = 24,
+    limit: int = 500
+) -> List[Optional[pd.DataFrame]]:
+    """
+    Fetch all pairs concurrently over one connection pool
+
+    Returns:
+        One DataFrame (or None) per pair, in the order of pairs
+    """
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        return await asyncio.gather(*(
+            fetch_klines(client, fetcher, pair, interval, hours, limit)
+            for pair in pairs
+        ))
+
+
+def scan_all_sync(
+    fetcher: DataFetcher,
+    pairs: Sequence[str],
+    interval: str,
+    hours: int = 24,
+    limit: int = 500
+) -> List[Optional[pd.DataFrame]]:
+    """
+    Blocking wrapper for scan_all (Streamlit script threads have no running loop)
+
+    The HTTP client lives only for one scan: httpx clients are bound to the
+    event loop they were first used on, and asyncio.run makes a new one.
+    """
+    return asyncio.run(scan_all(fetcher, pairs, interval, hours, limit))
@@ -0,0 +1,34 @@
+"""
+Page Bootstrap
+Common preamble for Streamlit pages
+"""
+
+import streamlit as st
+
+from .auth_helpers import init_session_state
+from .pwa_support import inject_pwa_support
+from .responsive_layout import apply_responsive_layout
+
+
+def configure(title: str, icon: str, layout: str = "centered"):
+    """
+    Configure the current page: page config, PWA, responsive layout, session
+
+    Pages don't need a sys.path tweak to import this - `streamlit run`
+    puts the main script's directory (the repo root) on sys.path.
+
+    Args:
+        title: Browser tab title
+        icon: Page icon (emoji)
+        layout: "centered" or "wide"
+    """
+    st.set_page_config(page_title=title, page_icon=icon, layout=layout)
+
+    # 💻 PWA Support
+    inject_pwa_support()
+
+    # 📱 Responsive Layout
+    apply_responsive_layout()
+
+    # Initialize session
+    init_session_state()
@@ -3,6 +3,8 @@ PWA Support Module
 Add Progressive Web App capabilities to Streamlit
 """
 
+import re
+
 PWA_HEAD_HTML = """
 <!-- PWA Meta Tags -->
 <meta name="mobile-web-app-capable" content="yes">
@@ -86,20 +88,39 @@ PWA_HEAD_HTML = """
 """
 
 
+
+def _minify_html(html: str) -> str:
+    """Strip HTML comments, indentation and blank lines (line breaks kept for inline JS)"""
+    html = re.sub(r'<!--.*?-->', '', html, flags=re.S)
+    return '\n'.join(line.strip() for line in html.splitlines() if line.strip())
+
+
+# Minified once at import - this is what gets sent to the browser
+PWA_HEAD_HTML_MIN = _minify_html(PWA_HEAD_HTML)
+
+
 def inject_pwa_support():
-    """Inject PWA support into Streamlit page"""
+    """Inject PWA support into Streamlit page (once per session)"""
     import streamlit as st
     import streamlit.components.v1 as components
 
+    if st.session_state.get('_pwa_injected'):
+        return
+    st.session_state['_pwa_injected'] = True
+
     # Inject meta tags and scripts
-    components.html(PWA_HEAD_HTML, height=0)
+    components.html(PWA_HEAD_HTML_MIN, height=0)
 
 
 def show_install_button():
-    """Show PWA install button"""
+    """Show PWA install button (once per session)"""
     import streamlit as st
     import streamlit.components.v1 as components
 
+    if st.session_state.get('_pwa_install_button_shown'):
+        return
+    st.session_state['_pwa_install_button_shown'] = True
+
     install_html = """
     <div style="position: fixed; bottom: 20px; right: 20px; z-index: 9999;">
         <button onclick="installPWA()" style="
@@ -3,220 +3,251 @@ Responsive Layout Module
 Optimize layout for PC, Tablet, and Mobile devices
 """
 
-RESPONSIVE_CSS = """
-<style>
-    /* ===== RESPONSIVE LAYOUT ===== */
-
-    /* Mobile First Approach */
-    /* Mobile (320px - 767px) */
-    @media (max-width: 767px) {
-        /* Full width on mobile */
-        .main .block-container {
-            padding: 1rem !important;
-            max-width: 100% !important;
-        }
+import os
+from typing import Optional
+
+from .css_utils import head_styles_html, optimize_css, publish_static_css
+
+# Debug-only UI (device indicator) is shown only with APP_DEBUG=1
+_SHOW_DEVICE_IND = os.getenv('APP_DEBUG') == '1'
+
+# ===== RESPONSIVE LAYOUT =====
+# The stylesheet is split by media query. Each chunk is emitted as its own
+# <style media="...">, so the browser skips rules for non-matching media
+# when building the CSSOM. Chunks are emitted in this order, which is also
+# the cascade order (later chunks win on equal specificity).
+
+# Mobile First Approach
+# Mobile (320px - 767px)
+_MEDIA_MOBILE = "(max-width: 767px)"
+_CSS_MOBILE = """
+    /* Full width on mobile */
+    .main .block-container {
+        padding: 1rem !important;
+        max-width: 100% !important;
+    }
 
-        /* Stack columns vertically */
-        [data-testid="column"] {
-            width: 100% !important;
-            min-width: 100% !important;
-            flex: 100% !important;
-        }
+    /* Stack columns vertically */
+    [data-testid="column"] {
+        width: 100% !important;
+        min-width: 100% !important;
+        flex: 100% !important;
+    }
 
-        /* Smaller headers */
-        h1 { font-size: 1.8rem !important; }
-        h2 { font-size: 1.5rem !important; }
-        h3 { font-size: 1.3rem !important; }
+    /* Smaller headers */
+    h1 { font-size: 1.8rem !important; }
+    h2 { font-size: 1.5rem !important; }
+    h3 { font-size: 1.3rem !important; }
 
-        /* Compact metrics */
-        [data-testid="stMetricValue"] {
-            font-size: 1.5rem !important;
-        }
+    /* Compact metrics */
+    [data-testid="stMetricValue"] {
+        font-size: 1.5rem !important;
+    }
 
-        [data-testid="stMetricLabel"] {
-            font-size: 0.9rem !important;
-        }
+    [data-testid="stMetricLabel"] {
+        font-size: 0.9rem !important;
+    }
 
-        /* Smaller buttons */
-        .stButton>button {
-            padding: 0.5rem 1rem !important;
-            font-size: 0.9rem !important;
-            width: 100% !important;
-        }
+    /* Smaller buttons */
+    .stButton>button {
+        padding: 0.5rem 1rem !important;
+        font-size: 0.9rem !important;
+        width: 100% !important;
+    }
 
-        /* Hide sidebar by default on mobile */
-        [data-testid="stSidebar"] {
-            display: none;
-        }
+    /* Hide sidebar by default on mobile */
+    [data-testid="stSidebar"] {
+        display: none;
+    }
 
-        [data-testid="stSidebar"][aria-expanded="true"] {
-            display: block;
-            position: fixed;
-            left: 0;
-            top: 0;
-            width: 80% !important;
-            max-width: 280px !important;
-            height: 100vh;
-            z-index: 999999;
-        }
+    [data-testid="stSidebar"][aria-expanded="true"] {
+        display: block;
+        position: fixed;
+        left: 0;
+        top: 0;
+        width: 80% !important;
+        max-width: 280px !important;
+        height: 100vh;
+        z-index: 999999;
+    }
 
-        /* Compact inputs */
-        .stTextInput>div>div>input,
-        .stNumberInput>div>div>input,
-        .stSelectbox>div>div>select {
-            font-size: 0.9rem !important;
-            padding: 0.5rem !important;
-        }
+    /* Compact inputs */
+    .stTextInput>div>div>input,
+    .stNumberInput>div>div>input,
+    .stSelectbox>div>div>select {
+        font-size: 0.9rem !important;
+        padding: 0.5rem !important;
+    }
 
-        /* Smaller dataframes */
-        .stDataFrame {
-            font-size: 0.8rem !important;
-            overflow-x: auto !important;
-        }
+    /* Smaller dataframes */
+    .stDataFrame {
+        font-size: 0.8rem !important;
+        overflow-x: auto !important;
+    }
 
-        /* Compact forms */
-        [data-testid="stForm"] {
-            padding: 1rem !important;
-        }
+    /* Compact forms */
+    [data-testid="stForm"] {
+        padding: 1rem !important;
+    }
 
-        /* Stack charts vertically */
-        .js-plotly-plot {
-            max-width: 100% !important;
-        }
+    /* Stack charts vertically */
+    .js-plotly-plot {
+        max-width: 100% !important;
+    }
 
-        /* Mobile navigation */
-        .stTabs [data-baseweb="tab-list"] {
-            overflow-x: auto !important;
-            flex-wrap: nowrap !important;
-        }
+    /* Mobile navigation */
+    .stTabs [data-baseweb="tab-list"] {
+        overflow-x: auto !important;
+        flex-wrap: nowrap !important;
+    }
 
-        .stTabs [data-baseweb="tab"] {
-            font-size: 0.85rem !important;
-            padding: 0.5rem 0.75rem !important;
-        }
+    .stTabs [data-baseweb="tab"] {
+        font-size: 0.85rem !important;
+        padding: 0.5rem 0.75rem !important;
     }
+"""
 
-    /* Tablet (768px - 1023px) */
-    @media (min-width: 768px) and (max-width: 1023px) {
-        /* Medium width container */
-        .main .block-container {
-            padding: 2rem 1.5rem !important;
-            max-width: 95% !important;
-        }
+# ===== TOUCH OPTIMIZATION =====
+# Mobile only, not needed for first paint
+_CSS_TOUCH = """
+    /* Larger touch targets on mobile */
+    button, a, input, select {
+        min-height: 44px !important;
+        min-width: 44px !important;
+    }
 
-        /* Two column layout */
-        [data-testid="column"] {
-            min-width: 45% !important;
-        }
+    /* Prevent text selection on touch */
+    .stButton>button {
+        -webkit-tap-highlight-color: transparent;
+        -webkit-touch-callout: none;
+        user-select: none;
+    }
+"""
 
-        /* Medium headers */
-        h1 { font-size: 2.2rem !important; }
-        h2 { font-size: 1.8rem !important; }
-        h3 { font-size: 1.5rem !important; }
+# Tablet (768px - 1023px)
+_MEDIA_TABLET = "(min-width: 768px) and (max-width: 1023px)"
+_CSS_TABLET = """
+    /* Medium width container */
+    .main .block-container {
+        padding: 2rem 1.5rem !important;
+        max-width: 95% !important;
+    }
 
-        /* Sidebar optimized */
-        [data-testid="stSidebar"] {
-            width: 250px !important;
-        }
+    /* Two column layout */
+    [data-testid="column"] {
+        min-width: 45% !important;
+    }
 
-        /* Medium buttons */
-        .stButton>button {
-            padding: 0.6rem 1.5rem !important;
-            font-size: 0.95rem !important;
-        }
+    /* Medium headers */
+    h1 { font-size: 2.2rem !important; }
+    h2 { font-size: 1.8rem !important; }
+    h3 { font-size: 1.5rem !important; }
 
-        /* Metrics size */
-        [data-testid="stMetricValue"] {
-            font-size: 1.8rem !important;
-        }
+    /* Sidebar optimized */
+    [data-testid="stSidebar"] {
+        width: 250px !important;
+    }
 
-        /* Responsive dataframes */
-        .stDataFrame {
-            font-size: 0.9rem !important;
-        }
+    /* Medium buttons */
+    .stButton>button {
+        padding: 0.6rem 1.5rem !important;
+        font-size: 0.95rem !important;
+    }
 
-        /* Compact tabs */
-        .stTabs [data-baseweb="tab"] {
-            font-size: 0.9rem !important;
-            padding: 0.6rem 1rem !important;
-        }
+    /* Metrics size */
+    [data-testid="stMetricValue"] {
+        font-size: 1.8rem !important;
     }
 
-    /* Desktop (1024px+) */
-    @media (min-width: 1024px) {
-        /* Wide container */
-        .main .block-container {
-            padding: 3rem 2rem !important;
-            max-width: 1400px !important;
-        }
+    /* Responsive dataframes */
+    .stDataFrame {
+        font-size: 0.9rem !important;
+    }
 
-        /* Full sidebar */
-        [data-testid="stSidebar"] {
-            width: 300px !important;
-        }
+    /* Compact tabs */
+    .stTabs [data-baseweb="tab"] {
+        font-size: 0.9rem !important;
+        padding: 0.6rem 1rem !important;
+    }
+"""
 
-        /* Large headers */
-        h1 { font-size: 2.6rem !important; }
-        h2 { font-size: 2.1rem !important; }
-        h3 { font-size: 1.7rem !important; }
+# Desktop (1024px+)
+_MEDIA_DESKTOP = "(min-width: 1024px)"
+_CSS_DESKTOP = """
+    /* Wide container */
+    .main .block-container {
+        padding: 3rem 2rem !important;
+        max-width: 1400px !important;
+    }
 
-        /* Full size buttons */
-        .stButton>button {
-            padding: 0.7rem 2rem !important;
-            font-size: 1rem !important;
-        }
+    /* Full sidebar */
+    [data-testid="stSidebar"] {
+        width: 300px !important;
+    }
 
-        /* Large metrics */
-        [data-testid="stMetricValue"] {
-            font-size: 2.2rem !important;
-        }
+    /* Large headers */
+    h1 { font-size: 2.6rem !important; }
+    h2 { font-size: 2.1rem !important; }
+    h3 { font-size: 1.7rem !important; }
 
-        /* Full dataframes */
-        .stDataFrame {
-            font-size: 1rem !important;
-        }
+    /* Full size buttons */
+    .stButton>button {
+        padding: 0.7rem 2rem !important;
+        font-size: 1rem !important;
+    }
 
-        /* Wide charts */
-        .js-plotly-plot {
-            min-width: 100% !important;
-        }
+    /* Large metrics */
+    [data-testid="stMetricValue"] {
+        font-size: 2.2rem !important;
     }
 
-    /* ===== TOUCH OPTIMIZATION ===== */
+    /* Full dataframes */
+    .stDataFrame {
+        font-size: 1rem !important;
+    }
 
-    /* Larger touch targets on mobile */
-    @media (max-width: 767px) {
-        button, a, input, select {
-            min-height: 44px !important;
-            min-width: 44px !important;
-        }
+    /* Wide charts */
+    .js-plotly-plot {
+        min-width: 100% !important;
+    }
+"""
 
-        /* Prevent text selection on touch */
-        .stButton>button {
-            -webkit-tap-highlight-color: transparent;
-            -webkit-touch-callout: none;
-            user-select: none;
-        }
+# ===== LANDSCAPE MODE =====
+# Mobile landscape
+_MEDIA_LANDSCAPE = "(max-width: 767px) and (orientation: landscape)"
+_CSS_LANDSCAPE = """
+    .main .block-container {
+        padding: 0.5rem !important;
     }
 
-    /* ===== LANDSCAPE MODE ===== */
+    h1 { font-size: 1.5rem !important; }
+    h2 { font-size: 1.3rem !important; }
 
-    /* Mobile landscape */
-    @media (max-width: 767px) and (orientation: landscape) {
-        .main .block-container {
-            padding: 0.5rem !important;
-        }
-
-        h1 { font-size: 1.5rem !important; }
-        h2 { font-size: 1.3rem !important; }
+    [data-testid="stMetricValue"] {
+        font-size: 1.3rem !important;
+    }
+"""
 
-        [data-testid="stMetricValue"] {
-            font-size: 1.3rem !important;
+# ===== SAFE AREA (iOS Notch) =====
+_CSS_SAFE_AREA = """
+    /* Padding for iOS safe areas */
+    @supports (padding: max(0px)) {
+        .main .block-container {
+            padding-left: max(1rem, env(safe-area-inset-left)) !important;
+            padding-right: max(1rem, env(safe-area-inset-right)) !important;
+            padding-top: max(1rem, env(safe-area-inset-top)) !important;
+            padding-bottom: max(1rem, env(safe-area-inset-bottom)) !important;
         }
     }
 
-    /* ===== ACCESSIBILITY ===== */
+    /* Smooth scrolling */
+    html {
+        scroll-behavior: smooth;
+    }
+"""
 
+# ===== ACCESSIBILITY =====
+_CSS_A11Y = """
     /* Focus indicators */
     button:focus, input:focus, select:focus {
         outline: 2px solid #00ff41 !important;
@@ -230,106 +261,185 @@ RESPONSIVE_CSS = """
         }
     }
 
-    /* Reduced motion support */
+    /* Reduced motion support (only elements that actually animate) */
     @media (prefers-reduced-motion: reduce) {
-        *, *::before, *::after {
+        .stButton>button,
+        .stTabs [data-baseweb="tab"],
+        .js-plotly-plot,
+        [data-testid="stSidebar"] {
             animation-duration: 0.01ms !important;
             animation-iteration-count: 1 !important;
             transition-duration: 0.01ms !important;
         }
     }
+"""
 
-    /* ===== PRINT OPTIMIZATION ===== */
-
-    @media print {
-        /* Hide unnecessary elements */
-        [data-testid="stSidebar"],
-        .stButton,
-        [data-testid="stHeader"] {
-            display: none !important;
-        }
+# ===== PERFORMANCE =====
+_CSS_PERF = """
+    /* Hardware acceleration (charts only - layers per button waste GPU memory) */
+    .js-plotly-plot {
+        transform: translateZ(0);
+        will-change: transform;
+    }
 
-        /* Black text on white background */
-        * {
-            background: white !important;
-            color: black !important;
-            text-shadow: none !important;
-            box-shadow: none !important;
-        }
+    /* Limit layout/paint invalidation instead of forcing compositor layers */
+    .stButton>button,
+    [data-testid="stMetricValue"] {
+        contain: layout style;
     }
 
-    /* ===== SAFE AREA (iOS Notch) ===== */
+    [data-testid="stSidebar"] {
+        contain: layout style paint;
+    }
+"""
 
-    /* Padding for iOS safe areas */
-    @supports (padding: max(0px)) {
-        .main .block-container {
-            padding-left: max(1rem, env(safe-area-inset-left)) !important;
-            padding-right: max(1rem, env(safe-area-inset-right)) !important;
-            padding-top: max(1rem, env(safe-area-inset-top)) !important;
-            padding-bottom: max(1rem, env(safe-area-inset-bottom)) !important;
-        }
+# ===== PWA FULLSCREEN =====
+# Hide UI chrome in PWA mode
+_MEDIA_STANDALONE = "(display-mode: standalone)"
+_CSS_STANDALONE = """
+    /* Full height */
+    .main {
+        min-height: 100vh !important;
     }
 
-    /* ===== PERFORMANCE ===== */
+    /* Add status bar padding */
+    .main .block-container {
+        padding-top: max(1rem, env(safe-area-inset-top, 20px)) !important;
+    }
+"""
 
-    /* Hardware acceleration */
-    .stButton>button,
+# ===== PRINT OPTIMIZATION =====
+_MEDIA_PRINT = "print"
+_CSS_PRINT = """
+    /* Hide unnecessary elements */
     [data-testid="stSidebar"],
-    .js-plotly-plot {
-        transform: translateZ(0);
-        will-change: transform;
+    .stButton,
+    [data-testid="stHeader"] {
+        display: none !important;
     }
 
-    /* Smooth scrolling */
-    html {
-        scroll-behavior: smooth;
+    /* Black text on white background */
+    * {
+        background: white !important;
+        color: black !important;
+        text-shadow: none !important;
+        box-shadow: none !important;
     }
+"""
 
-    /* ===== PWA FULLSCREEN ===== */
+# (name, media query or None, css, critical) in cascade order. Critical chunks
+# (page layout) are shipped inline so the first paint is laid out correctly;
+# the rest (accessibility, touch, PWA, print, compositing hints) is deferred.
+_CSS_CHUNKS = (
+    ("mobile", _MEDIA_MOBILE, _CSS_MOBILE, True),
+    ("tablet", _MEDIA_TABLET, _CSS_TABLET, True),
+    ("desktop", _MEDIA_DESKTOP, _CSS_DESKTOP, True),
+    ("landscape", _MEDIA_LANDSCAPE, _CSS_LANDSCAPE, True),
+    ("safe-area", None, _CSS_SAFE_AREA, True),
+    ("touch", _MEDIA_MOBILE, _CSS_TOUCH, False),
+    ("a11y", None, _CSS_A11Y, False),
+    ("perf", None, _CSS_PERF, False),
+    ("standalone", _MEDIA_STANDALONE, _CSS_STANDALONE, False),
+    ("print", _MEDIA_PRINT, _CSS_PRINT, False),
+)
+
+
+def _join_chunks(chunks) -> str:
+    """Concatenate chunks into one stylesheet, wrapping each in its @media"""
+    return "\n".join(
+        f"@media {media} {{{css}}}" if media else css
+        for _, media, css, _ in chunks
+    )
+
+
+# Full stylesheet as a single <style> block (for reference / st.markdown use)
+RESPONSIVE_CSS = "<style>\n" + _join_chunks(_CSS_CHUNKS) + "</style>\n"
+
+
+# Minified once at import - (style element id, media, css) per chunk
+_RESPONSIVE_STYLES = tuple(
+    (f"botx-responsive-{name}", media, optimize_css(css))
+    for name, media, css, _ in _CSS_CHUNKS
+)
+_CRITICAL_STYLES = tuple(
+    style for style, chunk in zip(_RESPONSIVE_STYLES, _CSS_CHUNKS) if chunk[3]
+)
+
+# Non-critical rules as one minified stylesheet, published as a static file
+# so the browser caches it instead of receiving it over the websocket
+_RESPONSIVE_CSS_MIN = optimize_css(
+    _join_chunks(chunk for chunk in _CSS_CHUNKS if not chunk[3])
+)
+
+# Published as static/responsive.css (see css_utils.publish_static_css)
+_STATIC_CSS_NAME = "responsive.css"
+
+# Reports the viewport width to the server as ?vw= (read by get_device_type)
+_REPORT_VW_JS = """
+        const url = new URL(window.parent.location.href);
+        url.searchParams.set('vw', window.parent.innerWidth);
+        window.parent.history.replaceState(window.parent.history.state, '', url);
+"""
 
-    /* Hide UI chrome in PWA mode */
-    @media (display-mode: standalone) {
-        /* Full height */
-        .main {
-            min-height: 100vh !important;
-        }
 
-        /* Add status bar padding */
-        .main .block-container {
-            padding-top: max(1rem, env(safe-area-inset-top, 20px)) !important;
-        }
-    }
-</style>
-"""
+def _static_css_url() -> Optional[str]:
+    """Versioned URL of static/responsive.css (None if it can't be written)"""
+    return publish_static_css(_STATIC_CSS_NAME, _RESPONSIVE_CSS_MIN)
 
 
-def apply_responsive_layout():
-    """Apply responsive layout to the current page"""
+def apply_responsive_layout(force: bool = False):
+    """
+    Apply responsive layout to the current page (once per session)
+
+    Args:
+        force: Re-inject even if already applied (e.g. after a theme switch)
+    """
     import streamlit as st
-    st.markdown(RESPONSIVE_CSS, unsafe_allow_html=True)
+    import streamlit.components.v1 as components
 
+    if st.session_state.get('_resp_css_injected') and not force:
+        return
 
-def get_device_type():
-    """Detect device type from viewport width"""
-    import streamlit.components.v1 as components
+    url = _static_css_url()
+    if url:
+        # Layout rules inline, the rest from the cached static file
+        html = head_styles_html(_CRITICAL_STYLES, deferred_url=url, extra_js=_REPORT_VW_JS)
+    else:
+        # Read-only deploy without the static file: ship everything inline
+        html = head_styles_html(_RESPONSIVE_STYLES, extra_js=_REPORT_VW_JS)
 
-    device_detect_js = """
-    <script>
-        const width = window.innerWidth;
-        const deviceType = width < 768 ? 'mobile' : (width < 1024 ? 'tablet' : 'desktop');
+    components.html(html, height=0)
+    st.session_state['_resp_css_injected'] = True
 
-        // Store in sessionStorage
-        sessionStorage.setItem('deviceType', deviceType);
 
-        // Send to Streamlit (if needed)
-        console.log('Device Type:', deviceType);
-    </script>
+def get_device_type() -> Optional[str]:
+    """
+    Detect device type from viewport width
+
+    The width is reported by the browser as a ``vw`` query param (set by the
+    apply_responsive_layout script) and read server-side - no extra iframe.
+
+    Returns:
+        'mobile', 'tablet' or 'desktop', or None until the width is known
     """
-    components.html(device_detect_js, height=0)
+    import streamlit as st
+
+    vw = st.session_state.get('vw')
+    if vw is None:
+        try:
+            vw = int(st.query_params.get('vw', ''))
+        except ValueError:
+            return None
+        st.session_state['vw'] = vw
+
+    return 'mobile' if vw < 768 else ('tablet' if vw < 1024 else 'desktop')
 
 
 def show_device_indicator():
-    """Show current device type indicator (for debugging)"""
+    """Show current device type indicator (for debugging, needs APP_DEBUG=1)"""
+    if not _SHOW_DEVICE_IND:
+        return
+
     import streamlit as st
 
     indicator_html = """
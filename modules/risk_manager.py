@@ -4,15 +4,15 @@ Implements hard limits and safety checks that CANNOT be overridden
 """
 
 import logging
-from typing import Dict, Optional, Tuple
+import numpy as np
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class PositionSize:
+class PositionSize(NamedTuple):
     """Position sizing calculation result"""
     amount: float  # Position size in base currency
     value_usd: float  # Position value in USD
@@ -21,12 +21,79 @@ class PositionSize:
     risk_percent: float  # Percentage risk
 
 
-@dataclass
-class TradeValidation:
+class TradeValidation(NamedTuple):
     """Trade validation result"""
     is_valid: bool
     message: str
-    failed_checks: list
+    failed_checks: Tuple[str, ...]
+
+
+# Shared result for the common all-checks-passed case
+_VALID = TradeValidation(is_valid=True, message="✅ All risk checks passed", failed_checks=())
+
+# (failed_check, message template) per validate_trade check, indexed by mask bit
+_MSG_TABLE = (
+    ("no_stop_loss", "❌ CRITICAL: Stop loss is mandatory for every trade"),
+    ("leverage_too_high", "❌ Leverage {leverage}x exceeds maximum {max_leverage}x"),
+    ("stop_loss_too_wide", "❌ Stop loss {sl_pct:.2f}% exceeds max {max_sl_pct}%"),
+    ("poor_risk_reward", "❌ R:R {rr:.2f} below minimum {min_rr}"),
+    ("daily_drawdown_exceeded", "🛑 CRITICAL: Daily drawdown {daily_dd:.2f}% exceeds limit {max_daily_dd}%"),
+    ("total_drawdown_exceeded", "🛑 CRITICAL: Total drawdown {total_dd:.2f}% exceeds limit {max_total_dd}%"),
+    ("max_positions_reached", "⚠️ Max concurrent positions reached ({max_positions})"),
+    ("daily_trade_limit", "⚠️ Daily trade limit reached ({max_trades_day})"),
+    ("loss_streak_cooldown", "⏸️ Cooldown active after {losses} losses. {remaining:.1f}h remaining"),
+)
+_CHECK_COOLDOWN = 8
+
+# Actions that check_override_attempt always refuses
+_PROHIBITED = frozenset({
+    "trade_without_stop_loss",
+    "leverage_above_10x",
+    "risk_above_2_percent",
+    "override_daily_drawdown",
+    "trade_during_loss_streak",
+    "all_in_position",
+    "martingale_averaging",
+    "trade_unstable_connection",
+})
+_OVERRIDE_MSG = "Safety rule ini tidak bisa di-override. Rule ini melindungi capital Anda dari catastrophic loss."
+
+@lru_cache(maxsize=None)
+def _compile_reason_mask(max_leverage, max_sl_pct, min_rr, max_daily_dd, max_total_dd,
+                         max_positions, max_trades_day):
+    """
+    Build a validate_trade check-mask function specialized for one set of limits
+
+    The (immutable) limits are bound as closure constants, so any number
+    works (inf = no limit); only account state is read from the instance
+    at call time.
+
+    Returns:
+        Function (risk_manager, entry, sl, take_profits, leverage, sl_pct) -> int mask
+    """
+    neg_max_daily_dd = -max_daily_dd
+    neg_max_total_dd = -max_total_dd
+
+    def _reason_mask(self, entry_price, stop_loss_price, take_profit_prices, leverage, sl_distance_percent):
+        poor_rr = False
+        if take_profit_prices:
+            sl_distance = abs(entry_price - stop_loss_price)
+            tp1_distance = abs(take_profit_prices[0] - entry_price)
+            rr_ratio = tp1_distance / sl_distance if sl_distance > 0 else 0
+            poor_rr = rr_ratio < min_rr
+        initial_capital = self.initial_capital
+        return int(
+            (leverage > max_leverage) << 1
+            | (sl_distance_percent > max_sl_pct) << 2
+            | poor_rr << 3
+            | ((self.daily_pnl / initial_capital) * 100 < neg_max_daily_dd) << 4
+            | (((self.current_capital - initial_capital) / initial_capital) * 100 < neg_max_total_dd) << 5
+            | (self.open_positions >= max_positions) << 6
+            | (self.daily_trades >= max_trades_day) << 7
+            | self._in_potential_cooldown << 8
+        )
+
+    return _reason_mask
 
 
 class RiskManager:
@@ -37,9 +104,41 @@ class RiskManager:
     NO OVERRIDES ALLOWED.
     """
 
+    __slots__ = (
+        'config', 'session_config',
+        # Cached limits (read on every validation)
+        '_max_leverage', '_max_sl_pct', '_min_rr', '_max_daily_dd', '_max_total_dd',
+        '_max_positions', '_max_trades_day', '_max_losses', '_cooldown_s',
+        '_max_risk_pct', '_max_pos_size', '_min_pos_size',
+        # State
+        'initial_capital', 'current_capital', 'daily_trades', 'consecutive_losses',
+        'last_trade_date', 'daily_pnl', 'total_pnl', 'open_positions',
+        'loss_streak_cooldown_until', '_in_potential_cooldown',
+        # Generated check-mask function for these limits
+        '_reason_mask',
+    )
+
     def __init__(self, config: Dict):
-        self.config = config['risk_management']
-        self.session_config = config['session_control']
+        risk = self.config = config['risk_management']
+        session = self.session_config = config['session_control']
+
+        # Hard limits, cached as attributes so hot paths skip the dict lookups
+        self._max_leverage = int(risk['max_leverage'])
+        self._max_sl_pct = risk['max_stop_loss_percent']
+        self._min_rr = risk['min_risk_reward_ratio']
+        self._max_daily_dd = risk['max_daily_drawdown']
+        self._max_total_dd = risk['max_total_drawdown']
+        self._max_positions = int(risk['max_concurrent_positions'])
+        self._max_risk_pct = risk['max_portfolio_risk_per_trade']
+        self._max_pos_size = risk['max_position_size']
+        self._min_pos_size = risk['min_position_size']
+        self._max_trades_day = int(session['max_trades_per_day'])
+        self._max_losses = int(session['max_consecutive_losses'])
+        self._cooldown_s = session['cooldown_after_loss_streak']
+        self._reason_mask = _compile_reason_mask(
+            self._max_leverage, self._max_sl_pct, self._min_rr, self._max_daily_dd,
+            self._max_total_dd, self._max_positions, self._max_trades_day
+        )
 
         # State tracking
         self.initial_capital = config['trading']['initial_capital']
@@ -51,6 +150,8 @@ class RiskManager:
         self.total_pnl = 0.0
         self.open_positions = 0
         self.loss_streak_cooldown_until = None
+        # consecutive_losses >= _max_losses, maintained where the streak changes
+        self._in_potential_cooldown = False
 
         logger.info("🛡️ Risk Manager initialized with strict limits")
         self._log_limits()
@@ -60,30 +161,36 @@ class RiskManager:
         logger.info("=" * 60)
         logger.info("RISK MANAGEMENT LIMITS (HARD LIMITS - NO OVERRIDE)")
         logger.info("=" * 60)
-        logger.info(f"Max Risk Per Trade: {self.config['max_portfolio_risk_per_trade']}%")
-        logger.info(f"Max Daily Drawdown: {self.config['max_daily_drawdown']}%")
-        logger.info(f"Max Total Drawdown: {self.config['max_total_drawdown']}%")
-        logger.info(f"Max Concurrent Positions: {self.config['max_concurrent_positions']}")
-        logger.info(f"Max Leverage: {self.config['max_leverage']}x")
-        logger.info(f"Max Stop Loss: {self.config['max_stop_loss_percent']}%")
-        logger.info(f"Min Risk:Reward: 1:{self.config['min_risk_reward_ratio']}")
-        logger.info(f"Max Trades Per Day: {self.session_config['max_trades_per_day']}")
+        logger.info("Max Risk Per Trade: %s%%", self.config['max_portfolio_risk_per_trade'])
+        logger.info("Max Daily Drawdown: %s%%", self.config['max_daily_drawdown'])
+        logger.info("Max Total Drawdown: %s%%", self.config['max_total_drawdown'])
+        logger.info("Max Concurrent Positions: %s", self.config['max_concurrent_positions'])
+        logger.info("Max Leverage: %sx", self.config['max_leverage'])
+        logger.info("Max Stop Loss: %s%%", self.config['max_stop_loss_percent'])
+        logger.info("Min Risk:Reward: 1:%s", self.config['min_risk_reward_ratio'])
+        logger.info("Max Trades Per Day: %s", self.session_config['max_trades_per_day'])
         logger.info("=" * 60)
 
-    def reset_daily_stats(self):
+    def reset_daily_stats(self, now: Optional[datetime] = None):
         """Reset daily statistics at start of new day"""
-        today = datetime.now().date()
+        today = (now or datetime.now()).date()
         if self.last_trade_date != today:
-            logger.info(f"📅 New trading day - resetting daily stats")
+            logger.info("📅 New trading day - resetting daily stats")
             self.daily_trades = 0
             self.daily_pnl = 0.0
             self.last_trade_date = today
 
+    @staticmethod
+    def _sl_dist_pct(entry_price: float, stop_loss_price: float) -> float:
+        """Stop loss distance as a percentage of the entry price"""
+        return abs(entry_price - stop_loss_price) / entry_price * 100
+
     def calculate_position_size(
         self,
         entry_price: float,
         stop_loss_price: float,
-        leverage: int = 5
+        leverage: int = 5,
+        sl_dist_pct: Optional[float] = None
     ) -> Optional[PositionSize]:
         """
         Calculate position size based on risk parameters
@@ -92,27 +199,34 @@ class RiskManager:
             entry_price: Entry price
             stop_loss_price: Stop loss price
             leverage: Desired leverage (will be capped at max)
+            sl_dist_pct: Precomputed _sl_dist_pct(entry_price, stop_loss_price)
 
         Returns:
             PositionSize object or None if invalid
         """
+        max_sl_pct = self._max_sl_pct
+        max_risk_pct = self._max_risk_pct
+        capital = self.current_capital
+
         # Cap leverage at maximum
-        leverage = min(leverage, self.config['max_leverage'])
+        leverage = min(leverage, self._max_leverage)
 
         # Calculate stop loss distance
-        sl_distance_percent = abs(entry_price - stop_loss_price) / entry_price * 100
+        sl_distance_percent = sl_dist_pct
+        if sl_distance_percent is None:
+            sl_distance_percent = self._sl_dist_pct(entry_price, stop_loss_price)
 
         # Validate stop loss distance
-        if sl_distance_percent > self.config['max_stop_loss_percent']:
-            logger.error(f"❌ Stop loss too wide: {sl_distance_percent:.2f}% > {self.config['max_stop_loss_percent']}%")
+        if sl_distance_percent > max_sl_pct:
+            logger.error("❌ Stop loss too wide: %.2f%% > %s%%", sl_distance_percent, max_sl_pct)
             return None
 
         if sl_distance_percent < 0.1:
-            logger.error(f"❌ Stop loss too tight: {sl_distance_percent:.2f}%")
+            logger.error("❌ Stop loss too tight: %.2f%%", sl_distance_percent)
             return None
 
         # Calculate risk amount in USD
-        max_risk_usd = self.current_capital * (self.config['max_portfolio_risk_per_trade'] / 100)
+        max_risk_usd = capital * (max_risk_pct / 100)
 
         # Calculate position size
         # Risk = Position Size * SL Distance
@@ -120,12 +234,12 @@ class RiskManager:
         position_value_usd = (max_risk_usd / sl_distance_percent) * 100
 
         # Apply position size limits
-        max_position_value = self.current_capital * (self.config['max_position_size'] / 100)
+        max_position_value = capital * (self._max_pos_size / 100)
         position_value_usd = min(position_value_usd, max_position_value)
 
         # Check minimum position size
-        if position_value_usd < self.config['min_position_size']:
-            logger.error(f"❌ Position size too small: ${position_value_usd:.2f} < ${self.config['min_position_size']}")
+        if position_value_usd < self._min_pos_size:
+            logger.error("❌ Position size too small: $%.2f < $%s", position_value_usd, self._min_pos_size)
             return None
 
         # Calculate amount in base currency (BTC)
@@ -136,7 +250,7 @@ class RiskManager:
             value_usd=position_value_usd,
             leverage=leverage,
             risk_usd=max_risk_usd,
-            risk_percent=self.config['max_portfolio_risk_per_trade']
+            risk_percent=max_risk_pct
         )
 
     def validate_trade(
@@ -145,134 +259,185 @@ class RiskManager:
         entry_price: float,
         stop_loss_price: float,
         take_profit_prices: list,
-        leverage: int
+        leverage: int,
+        sl_dist_pct: Optional[float] = None
     ) -> TradeValidation:
         """
         Comprehensive pre-trade validation
 
         This is the CRITICAL safety check before ANY trade execution.
         Returns validation result with specific failed checks.
+
+        sl_dist_pct may be passed in when the caller already computed it
+        (e.g. for calculate_position_size) to skip recomputation.
         """
-        failed_checks = []
+        # Single wall clock read for the whole validation
+        now = datetime.now()
 
         # Reset daily stats if new day
-        self.reset_daily_stats()
+        self.reset_daily_stats(now)
 
-        # 1. Check if stop loss exists
+        # 1. Check if stop loss exists (nothing below is computable without it)
         if stop_loss_price is None or stop_loss_price <= 0:
-            failed_checks.append("no_stop_loss")
-            return TradeValidation(
-                is_valid=False,
-                message="❌ CRITICAL: Stop loss is mandatory for every trade",
-                failed_checks=failed_checks
-            )
+            return self._reject(0)
 
-        # 2. Check leverage limit
-        if leverage > self.config['max_leverage']:
-            failed_checks.append("leverage_too_high")
-            return TradeValidation(
-                is_valid=False,
-                message=f"❌ Leverage {leverage}x exceeds maximum {self.config['max_leverage']}x",
-                failed_checks=failed_checks
-            )
+        sl_distance_percent = sl_dist_pct
+        if sl_distance_percent is None:
+            sl_distance_percent = self._sl_dist_pct(entry_price, stop_loss_price)
 
-        # 3. Check stop loss distance
-        sl_distance_percent = abs(entry_price - stop_loss_price) / entry_price * 100
-        if sl_distance_percent > self.config['max_stop_loss_percent']:
-            failed_checks.append("stop_loss_too_wide")
-            return TradeValidation(
-                is_valid=False,
-                message=f"❌ Stop loss {sl_distance_percent:.2f}% exceeds max {self.config['max_stop_loss_percent']}%",
-                failed_checks=failed_checks
-            )
+        # 2-9. One bit per check, in priority order (see _MSG_TABLE)
+        reason = self._reason_mask(
+            self, entry_price, stop_loss_price, take_profit_prices, leverage, sl_distance_percent
+        )
 
-        # 4. Check Risk:Reward ratio
-        if take_profit_prices and len(take_profit_prices) > 0:
-            tp1_distance = abs(take_profit_prices[0] - entry_price)
+        if not reason:
+            return _VALID
+
+        # Failure path: recompute the figures quoted in the message
+        rr_ratio = 0.0
+        if take_profit_prices:
             sl_distance = abs(entry_price - stop_loss_price)
+            tp1_distance = abs(take_profit_prices[0] - entry_price)
             rr_ratio = tp1_distance / sl_distance if sl_distance > 0 else 0
+        initial_capital = self.initial_capital
+        daily_dd_percent = (self.daily_pnl / initial_capital) * 100
+        total_dd_percent = ((self.current_capital - initial_capital) / initial_capital) * 100
+
+        check = (reason & -reason).bit_length() - 1
+        remaining = 0.0
+        if check == _CHECK_COOLDOWN:
+            remaining = self._cooldown_remaining_hours(now)
+            if remaining is None:
+                return _VALID
+
+        return self._reject(
+            check,
+            leverage=leverage,
+            sl_pct=sl_distance_percent,
+            rr=rr_ratio,
+            daily_dd=daily_dd_percent,
+            total_dd=total_dd_percent,
+            remaining=remaining,
+        )
 
-            if rr_ratio < self.config['min_risk_reward_ratio']:
-                failed_checks.append("poor_risk_reward")
-                return TradeValidation(
-                    is_valid=False,
-                    message=f"❌ R:R {rr_ratio:.2f} below minimum {self.config['min_risk_reward_ratio']}",
-                    failed_checks=failed_checks
-                )
-
-        # 5. Check daily drawdown limit
-        daily_dd_percent = (self.daily_pnl / self.initial_capital) * 100
-        if daily_dd_percent < -self.config['max_daily_drawdown']:
-            failed_checks.append("daily_drawdown_exceeded")
-            return TradeValidation(
-                is_valid=False,
-                message=f"🛑 CRITICAL: Daily drawdown {daily_dd_percent:.2f}% exceeds limit {self.config['max_daily_drawdown']}%",
-                failed_checks=failed_checks
-            )
+    def validate_trades_batch(
+        self,
+        entry_prices: np.ndarray,
+        stop_loss_prices: np.ndarray,
+        tp1_prices: np.ndarray,
+        leverages: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized pre-trade validation for backtests and parameter scans
 
-        # 6. Check total drawdown limit
-        total_dd_percent = ((self.current_capital - self.initial_capital) / self.initial_capital) * 100
-        if total_dd_percent < -self.config['max_total_drawdown']:
-            failed_checks.append("total_drawdown_exceeded")
-            return TradeValidation(
-                is_valid=False,
-                message=f"🛑 CRITICAL: Total drawdown {total_dd_percent:.2f}% exceeds limit {self.config['max_total_drawdown']}%",
-                failed_checks=failed_checks
-            )
+        Per-trade checks (stop loss, leverage, SL distance, R:R) are evaluated
+        across the arrays; account state checks (drawdown, positions, daily
+        trades, cooldown) are evaluated once and applied to every row.
 
-        # 7. Check concurrent positions limit
-        if self.open_positions >= self.config['max_concurrent_positions']:
-            failed_checks.append("max_positions_reached")
-            return TradeValidation(
-                is_valid=False,
-                message=f"⚠️ Max concurrent positions reached ({self.config['max_concurrent_positions']})",
-                failed_checks=failed_checks
-            )
+        Args:
+            entry_prices: Entry prices
+            stop_loss_prices: Stop loss prices
+            tp1_prices: First take profit prices (NaN = no take profit)
+            leverages: Requested leverage per trade
 
-        # 8. Check daily trade limit
-        if self.daily_trades >= self.session_config['max_trades_per_day']:
-            failed_checks.append("daily_trade_limit")
-            return TradeValidation(
-                is_valid=False,
-                message=f"⚠️ Daily trade limit reached ({self.session_config['max_trades_per_day']})",
-                failed_checks=failed_checks
-            )
+        Returns:
+            (passed, failure_codes) - bool mask and int8 codes where 0 means
+            passed and N means _MSG_TABLE[N - 1] failed first
+        """
+        entry = np.asarray(entry_prices, dtype=np.float64)
+        sl = np.asarray(stop_loss_prices, dtype=np.float64)
+        tp1 = np.asarray(tp1_prices, dtype=np.float64)
+        leverage = np.asarray(leverages)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sl_distance = np.abs(entry - sl)
+            sl_distance_percent = sl_distance / entry * 100
+            rr_ratio = np.where(sl_distance > 0, np.abs(tp1 - entry) / sl_distance, 0.0)
+            poor_rr = ~np.isnan(tp1) & (rr_ratio < self._min_rr)
+
+        conditions = [
+            ~(sl > 0),
+            leverage > self._max_leverage,
+            sl_distance_percent > self._max_sl_pct,
+            poor_rr,
+        ]
+        codes = np.select(conditions, [1, 2, 3, 4], 0).astype(np.int8)
 
-        # 9. Check consecutive losses and cooldown
-        if self.consecutive_losses >= self.session_config['max_consecutive_losses']:
-            if self.loss_streak_cooldown_until is None:
-                # Start cooldown
-                self.loss_streak_cooldown_until = datetime.now() + timedelta(
-                    seconds=self.session_config['cooldown_after_loss_streak']
-                )
-                logger.warning(f"⏸️ Loss streak detected. Cooldown until {self.loss_streak_cooldown_until}")
-
-            if datetime.now() < self.loss_streak_cooldown_until:
-                failed_checks.append("loss_streak_cooldown")
-                remaining = (self.loss_streak_cooldown_until - datetime.now()).total_seconds() / 3600
-                return TradeValidation(
-                    is_valid=False,
-                    message=f"⏸️ Cooldown active after {self.consecutive_losses} losses. {remaining:.1f}h remaining",
-                    failed_checks=failed_checks
-                )
-            else:
-                # Cooldown expired, reset
-                self.consecutive_losses = 0
-                self.loss_streak_cooldown_until = None
-                logger.info("✅ Cooldown period ended. Resetting loss streak.")
-
-        # All checks passed
-        return TradeValidation(
-            is_valid=True,
-            message="✅ All risk checks passed",
-            failed_checks=[]
+        state_code = self._account_state_check(datetime.now())
+        if state_code:
+            codes[codes == 0] = state_code + 1
+
+        return codes == 0, codes
+
+    def _account_state_check(self, now: datetime) -> int:
+        """
+        Evaluate the account-level checks shared by every candidate trade
+
+        Returns:
+            _MSG_TABLE index of the first failing check, or 0 if all pass
+        """
+        self.reset_daily_stats(now)
+
+        if (self.daily_pnl / self.initial_capital) * 100 < -self._max_daily_dd:
+            return 4
+        if ((self.current_capital - self.initial_capital) / self.initial_capital) * 100 < -self._max_total_dd:
+            return 5
+        if self.open_positions >= self._max_positions:
+            return 6
+        if self.daily_trades >= self._max_trades_day:
+            return 7
+        if self._in_potential_cooldown and self._cooldown_remaining_hours(now) is not None:
+            return _CHECK_COOLDOWN
+        return 0
+
+    def _reject(self, check: int, **values) -> TradeValidation:
+        """Build the failed validation result for a check index in _MSG_TABLE"""
+        name, template = _MSG_TABLE[check]
+        message = template.format(
+            max_leverage=self._max_leverage,
+            max_sl_pct=self._max_sl_pct,
+            min_rr=self._min_rr,
+            max_daily_dd=self._max_daily_dd,
+            max_total_dd=self._max_total_dd,
+            max_positions=self._max_positions,
+            max_trades_day=self._max_trades_day,
+            losses=self.consecutive_losses,
+            **values
         )
+        return TradeValidation(is_valid=False, message=message, failed_checks=(name,))
+
+    def _cooldown_remaining_hours(self, now: datetime) -> Optional[float]:
+        """
+        Start or expire the loss-streak cooldown
+
+        Args:
+            now: Current wall clock time
+
+        Returns:
+            Hours of cooldown remaining, or None if the cooldown is over
+        """
+        if self.loss_streak_cooldown_until is None:
+            # Start cooldown
+            self.loss_streak_cooldown_until = now + timedelta(
+                seconds=self._cooldown_s
+            )
+            logger.warning("⏸️ Loss streak detected. Cooldown until %s", self.loss_streak_cooldown_until)
+
+        if now < self.loss_streak_cooldown_until:
+            return (self.loss_streak_cooldown_until - now).total_seconds() / 3600
+
+        # Cooldown expired, reset
+        self.consecutive_losses = 0
+        self.loss_streak_cooldown_until = None
+        self._in_potential_cooldown = False
+        logger.info("✅ Cooldown period ended. Resetting loss streak.")
+        return None
 
     def update_position_opened(self, position_value_usd: float):
         """Update state after opening position"""
         self.open_positions += 1
         self.daily_trades += 1
-        logger.info(f"📊 Position opened. Open: {self.open_positions}, Daily trades: {self.daily_trades}")
+        logger.info("📊 Position opened. Open: %d, Daily trades: %d", self.open_positions, self.daily_trades)
 
     def update_position_closed(self, pnl_usd: float):
         """Update state after closing position"""
@@ -284,17 +449,19 @@ class RiskManager:
         # Update consecutive losses
         if pnl_usd < 0:
             self.consecutive_losses += 1
-            logger.warning(f"❌ Loss recorded. Consecutive losses: {self.consecutive_losses}")
+            self._in_potential_cooldown = self.consecutive_losses >= self._max_losses
+            logger.warning("❌ Loss recorded. Consecutive losses: %d", self.consecutive_losses)
         else:
             self.consecutive_losses = 0
             self.loss_streak_cooldown_until = None
-            logger.info(f"✅ Win recorded. Consecutive losses reset.")
+            self._in_potential_cooldown = False
+            logger.info("✅ Win recorded. Consecutive losses reset.")
 
         # Calculate percentages
         daily_dd_pct = (self.daily_pnl / self.initial_capital) * 100
         total_dd_pct = ((self.current_capital - self.initial_capital) / self.initial_capital) * 100
 
-        logger.info(f"💰 Capital: ${self.current_capital:.2f} | Daily: {daily_dd_pct:.2f}% | Total: {total_dd_pct:.2f}%")
+        logger.info("💰 Capital: $%.2f | Daily: %.2f%% | Total: %.2f%%", self.current_capital, daily_dd_pct, total_dd_pct)
 
     def get_stats(self) -> Dict:
         """Get current risk statistics"""
@@ -320,20 +487,8 @@ class RiskManager:
         Returns:
             (is_prohibited, response_message)
         """
-        prohibited = [
-            "trade_without_stop_loss",
-            "leverage_above_10x",
-            "risk_above_2_percent",
-            "override_daily_drawdown",
-            "trade_during_loss_streak",
-            "all_in_position",
-            "martingale_averaging",
-            "trade_unstable_connection"
-        ]
-
-        if action in prohibited:
-            response = "Safety rule ini tidak bisa di-override. Rule ini melindungi capital Anda dari catastrophic loss."
-            logger.error(f"🚫 Override attempt blocked: {action}")
-            return True, response
+        if action in _PROHIBITED:
+            logger.error("🚫 Override attempt blocked: %s", action)
+            return True, _OVERRIDE_MSG
 
         return False, ""
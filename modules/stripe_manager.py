@@ -5,17 +5,176 @@ Handles payment processing and license delivery
 
 import stripe
 import os
+import logging
+import hmac
+import time
+import atexit
+import hashlib
+import asyncio
+import functools
+import threading
+import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 from dotenv import load_dotenv
 
+# Prefer orjson (faster, parses bytes directly); fall back to stdlib json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Configure Stripe
 stripe.api_key = os.getenv('STRIPE_SECRET_KEY', '')
 
 
+def log_errors_once(message: str, window: float = 60):
+    """
+    Decorator: log exceptions as "{message}: {error}" and return None
+
+    Repeats of the same exception type from the same function are logged at
+    most once per window, so a retry storm can't flood the log.
+
+    Args:
+        message: Log message prefix
+        window: Seconds during which duplicates are suppressed
+    """
+    def decorator(func):
+        last_logged: Dict[str, float] = {}
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                now = time.monotonic()
+                key = type(e).__name__
+                if now - last_logged.get(key, float('-inf')) >= window:
+                    last_logged[key] = now
+                    logger.error("%s: %s", message, e)
+                return None
+
+        return wrapper
+
+    return decorator
+
+
+def _build_http_client() -> stripe.RequestsClient:
+    """Stripe HTTP client backed by one pooled keep-alive requests.Session"""
+    session = requests.Session()
+    # Stripe retries on its own (stripe.max_network_retries)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+    session.mount('https://', adapter)
+    return stripe.RequestsClient(session=session, verify_ssl_certs=True)
+
+
+# Shared by every Stripe API call so TLS connections are reused
+_HTTP_CLIENT = _build_http_client()
+stripe.default_http_client = _HTTP_CLIENT
+atexit.register(_HTTP_CLIENT.close)
+
+# Worker threads for the *_async wrappers. Webhooks get their own pool so a
+# burst of retried deliveries can't starve checkout creation.
+_API_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='stripe-api')
+_WEBHOOK_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='stripe-webhook')
+
+
+async def _run_in_executor(executor: ThreadPoolExecutor, func, *args, **kwargs):
+    """Run a blocking Stripe call off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+def _verify_signature(payload: bytes, sig_header: str, secret: bytes, tolerance: int = 300):
+    """
+    Verify a Stripe-Signature header (HMAC-SHA256 of "{timestamp}.{payload}")
+
+    The MAC is fed the timestamp and the raw payload bytes separately, so the
+    signed message is never decoded, re-encoded or concatenated.
+
+    Args:
+        payload: Raw request body
+        sig_header: Stripe-Signature header value
+        secret: Webhook signing secret
+        tolerance: Maximum age of the timestamp in seconds
+
+    Raises:
+        stripe.error.SignatureVerificationError: Malformed header, bad
+            signature or stale timestamp
+    """
+    timestamp = None
+    signatures = []
+    for item in (sig_header or '').split(','):
+        key, _, value = item.partition('=')
+        if key == 't':
+            timestamp = value
+        elif key == 'v1':
+            signatures.append(value.encode())
+
+    if not timestamp or not signatures:
+        raise stripe.error.SignatureVerificationError(
+            "Unable to extract timestamp and signatures from header", sig_header, payload
+        )
+
+    mac = hmac.new(secret, timestamp.encode() + b'.', hashlib.sha256)
+    mac.update(payload)
+    expected = mac.hexdigest().encode()
+
+    if not any(hmac.compare_digest(expected, sig) for sig in signatures):
+        raise stripe.error.SignatureVerificationError(
+            "No signatures found matching the expected signature for payload", sig_header, payload
+        )
+
+    if tolerance and int(timestamp) < time.time() - tolerance:
+        raise stripe.error.SignatureVerificationError(
+            "Timestamp outside the tolerance zone", sig_header, payload
+        )
+
+
+def _build_checkout_params(prices: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Precompute the static part of Session.create kwargs for each price key
+
+    Args:
+        prices: Pricing table (StripeManager.PRICES)
+
+    Returns:
+        {price_key: kwargs without customer_email/success_url/cancel_url}
+    """
+    params = {}
+    for price_key, price_info in prices.items():
+        params[price_key] = {
+            'payment_method_types': ['card'],
+            'line_items': [{
+                'price_data': {
+                    'currency': price_info['currency'],
+                    'unit_amount': price_info['amount'],
+                    'product_data': {
+                        'name': f"Binance Algo Bot - {price_info['name']}",
+                        'description': f"{price_info['tier'].upper()} tier access for {price_info['duration_days']} days",
+                    },
+                },
+                'quantity': 1,
+            }],
+            'mode': 'payment',
+            'metadata': {
+                'tier': price_info['tier'],
+                'duration_days': price_info['duration_days'],
+                'price_key': price_key
+            }
+        }
+    return params
+
+
 class StripeManager:
     """
     Manage Stripe payments and license delivery
@@ -59,10 +218,26 @@ class StripeManager:
         }
     }
 
+    # Static checkout kwargs per price key (built once from PRICES)
+    _CHECKOUT_PARAMS = _build_checkout_params(PRICES)
+
+    # Number of webhook event IDs remembered for duplicate detection
+    SEEN_EVENTS_MAX = 10_000
+
     def __init__(self):
         """Initialize Stripe manager"""
         self.api_key = stripe.api_key
+        self.http_client = _HTTP_CLIENT
+
+        # Webhook signing secret, read once and kept as the bytes HMAC needs
+        self._webhook_secret = os.getenv('STRIPE_WEBHOOK_SECRET', '').encode()
+        self._have_secret = bool(self._webhook_secret)
+
+        # Recently processed webhook event IDs (Stripe delivers at-least-once)
+        self._seen_events = OrderedDict()
+        self._seen_lock = threading.Lock()
 
+    @log_errors_once("Error creating checkout session")
     def create_checkout_session(
         self,
         price_key: str,
@@ -82,47 +257,31 @@ class StripeManager:
         Returns:
             Checkout session dict or None
         """
-        try:
-            if price_key not in self.PRICES:
-                raise ValueError(f"Invalid price key: {price_key}")
-
-            price_info = self.PRICES[price_key]
-
-            # Create checkout session
-            session = stripe.checkout.Session.create(
-                payment_method_types=['card'],
-                line_items=[{
-                    'price_data': {
-                        'currency': price_info['currency'],
-                        'unit_amount': price_info['amount'],
-                        'product_data': {
-                            'name': f"Binance Algo Bot - {price_info['name']}",
-                            'description': f"{price_info['tier'].upper()} tier access for {price_info['duration_days']} days",
-                        },
-                    },
-                    'quantity': 1,
-                }],
-                mode='payment',
-                customer_email=customer_email,
-                success_url=success_url + '?session_id={CHECKOUT_SESSION_ID}',
-                cancel_url=cancel_url,
-                metadata={
-                    'tier': price_info['tier'],
-                    'duration_days': price_info['duration_days'],
-                    'price_key': price_key
-                }
-            )
-
-            return {
-                'session_id': session.id,
-                'url': session.url,
-                'status': session.payment_status
-            }
+        params = self._CHECKOUT_PARAMS.get(price_key)
+        if params is None:
+            raise ValueError(f"Invalid price key: {price_key}")
+
+        # Create checkout session (only per-customer fields are added)
+        session = stripe.checkout.Session.create(
+            **params,
+            customer_email=customer_email,
+            success_url=success_url + '?session_id={CHECKOUT_SESSION_ID}',
+            cancel_url=cancel_url
+        )
+
+        return {
+            'session_id': session.id,
+            'url': session.url,
+            'status': session.payment_status
+        }
 
-        except Exception as e:
-            print(f"Error creating checkout session: {e}")
-            return None
+    @staticmethod
+    def _retrieve_paid_session(session_id: str):
+        """Retrieve a checkout session, or None if it isn't paid"""
+        session = stripe.checkout.Session.retrieve(session_id)
+        return session if session.payment_status == 'paid' else None
 
+    @log_errors_once("Error verifying payment")
     def verify_payment(self, session_id: str) -> Optional[Dict]:
         """
         Verify payment was successful
@@ -133,25 +292,47 @@ class StripeManager:
         Returns:
             Payment info dict or None
         """
-        try:
-            session = stripe.checkout.Session.retrieve(session_id)
-
-            if session.payment_status == 'paid':
-                return {
-                    'customer_email': session.customer_details.email,
-                    'amount_total': session.amount_total / 100,  # Convert to dollars
-                    'currency': session.currency,
-                    'tier': session.metadata.get('tier', 'pro'),
-                    'duration_days': int(session.metadata.get('duration_days', 30)),
-                    'payment_intent': session.payment_intent
-                }
+        session = self._retrieve_paid_session(session_id)
 
-            return None
+        if session is not None:
+            return {
+                'customer_email': session.customer_details.email,
+                'amount_total': session.amount_total / 100,  # Convert to dollars
+                'currency': session.currency,
+                'tier': session.metadata.get('tier', 'pro'),
+                'duration_days': int(session.metadata.get('duration_days', 30)),
+                'payment_intent': session.payment_intent
+            }
+
+        return None
 
-        except Exception as e:
-            print(f"Error verifying payment: {e}")
+    def _process_paid_session(self, session_id: str, license_manager) -> Optional[Dict]:
+        """Issue a license straight from the retrieved session (no payment info dict)"""
+        session = self._retrieve_paid_session(session_id)
+        if session is None:
             return None
 
+        metadata = session.metadata
+        tier = metadata.get('tier', 'pro')
+        duration_days = int(metadata.get('duration_days', 30))
+        customer_email = session.customer_details.email
+
+        license = license_manager.create_license(
+            tier=tier,
+            email=customer_email,
+            duration_days=duration_days,
+            max_activations=1
+        )
+
+        return {
+            'license_key': license.license_key,
+            'tier': tier,
+            'duration_days': duration_days,
+            'customer_email': customer_email,
+            'amount_paid': session.amount_total / 100
+        }
+
+    @log_errors_once("Error generating license from payment")
     def generate_license_from_payment(
         self,
         session_id: str,
@@ -167,36 +348,9 @@ class StripeManager:
         Returns:
             License info dict or None
         """
-        try:
-            # Verify payment
-            payment_info = self.verify_payment(session_id)
-
-            if not payment_info:
-                return None
-
-            # Generate license
-            tier = payment_info['tier']
-            duration_days = payment_info['duration_days']
-            customer_email = payment_info['customer_email']
-
-            license_key = license_manager.generate_license(
-                tier=tier,
-                duration_days=duration_days,
-                max_activations=1
-            )
-
-            return {
-                'license_key': license_key,
-                'tier': tier,
-                'duration_days': duration_days,
-                'customer_email': customer_email,
-                'amount_paid': payment_info['amount_total']
-            }
-
-        except Exception as e:
-            print(f"Error generating license from payment: {e}")
-            return None
+        return self._process_paid_session(session_id, license_manager)
 
+    @log_errors_once("Webhook error")
     def handle_webhook(self, payload: bytes, sig_header: str) -> Optional[Dict]:
         """
         Handle Stripe webhook events
@@ -205,45 +359,118 @@ class StripeManager:
             payload: Request payload
             sig_header: Stripe signature header
 
+        Events are not recorded as processed here: call
+        mark_event_processed(result['event_id']) once the event has been
+        fulfilled, so a redelivery after a failed fulfilment is handled again.
+
         Returns:
             Event data dict or None
         """
-        try:
-            webhook_secret = os.getenv('STRIPE_WEBHOOK_SECRET', '')
-
-            if not webhook_secret:
-                # For testing without webhook secret
-                import json
-                event = json.loads(payload)
-            else:
-                # Verify webhook signature
-                event = stripe.Webhook.construct_event(
-                    payload, sig_header, webhook_secret
-                )
-
-            # Handle different event types
-            if event['type'] == 'checkout.session.completed':
-                session = event['data']['object']
-
-                return {
-                    'type': 'payment_success',
-                    'session_id': session['id'],
-                    'customer_email': session['customer_details']['email'],
-                    'tier': session['metadata'].get('tier', 'pro'),
-                    'duration_days': int(session['metadata'].get('duration_days', 30))
-                }
-
-            elif event['type'] == 'payment_intent.succeeded':
-                return {
-                    'type': 'payment_confirmed',
-                    'payment_intent': event['data']['object']['id']
-                }
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
 
-            return None
+        if self._have_secret:
+            # Verify webhook signature only (construct_event would also
+            # build a full StripeObject we don't need)
+            _verify_signature(payload, sig_header, self._webhook_secret)
+        # Without a webhook secret (testing) the payload is trusted as-is
 
-        except Exception as e:
-            print(f"Webhook error: {e}")
-            return None
+        event = _loads(payload)
+
+        # Skip redelivered events before touching anything else
+        if self._is_duplicate_event(event.get('id')):
+            return {'type': 'duplicate', 'event_id': event['id']}
+
+        # Handle different event types
+        if event['type'] == 'checkout.session.completed':
+            session = event['data']['object']
+
+            return {
+                'type': 'payment_success',
+                'event_id': event.get('id'),
+                'session_id': session['id'],
+                'customer_email': session['customer_details']['email'],
+                'tier': session['metadata'].get('tier', 'pro'),
+                'duration_days': int(session['metadata'].get('duration_days', 30))
+            }
+
+        elif event['type'] == 'payment_intent.succeeded':
+            return {
+                'type': 'payment_confirmed',
+                'event_id': event.get('id'),
+                'payment_intent': event['data']['object']['id']
+            }
+
+        # Nothing to fulfil for other event types
+        self.mark_event_processed(event.get('id'))
+        return None
+
+    def _is_duplicate_event(self, event_id: Optional[str]) -> bool:
+        """
+        Check a webhook event ID against the processed events
+
+        Returns:
+            True if the event was already processed
+        """
+        if not event_id:
+            return False
+
+        with self._seen_lock:
+            if event_id in self._seen_events:
+                self._seen_events.move_to_end(event_id)
+                return True
+            return False
+
+    def mark_event_processed(self, event_id: Optional[str]):
+        """
+        Record a webhook event as handled (bounded LRU)
+
+        Call after the event returned by handle_webhook has been fulfilled;
+        later redeliveries of it then come back as {'type': 'duplicate'}.
+        """
+        if not event_id:
+            return
+
+        with self._seen_lock:
+            self._seen_events[event_id] = None
+            self._seen_events.move_to_end(event_id)
+            if len(self._seen_events) > self.SEEN_EVENTS_MAX:
+                self._seen_events.popitem(last=False)
+
+    # ===== ASYNC WRAPPERS =====
+    # Same as the sync methods, but run in a worker thread so callers on an
+    # event loop (e.g. next to TelegramNotifier) are not blocked by Stripe I/O
+
+    async def create_checkout_session_async(
+        self,
+        price_key: str,
+        customer_email: str,
+        success_url: str,
+        cancel_url: str
+    ) -> Optional[Dict]:
+        """Non-blocking create_checkout_session"""
+        return await _run_in_executor(
+            _API_EXECUTOR, self.create_checkout_session,
+            price_key, customer_email, success_url, cancel_url
+        )
+
+    async def verify_payment_async(self, session_id: str) -> Optional[Dict]:
+        """Non-blocking verify_payment"""
+        return await _run_in_executor(_API_EXECUTOR, self.verify_payment, session_id)
+
+    async def generate_license_from_payment_async(
+        self,
+        session_id: str,
+        license_manager
+    ) -> Optional[Dict]:
+        """Non-blocking generate_license_from_payment"""
+        return await _run_in_executor(
+            _API_EXECUTOR, self.generate_license_from_payment, session_id, license_manager
+        )
+
+    async def handle_webhook_async(self, payload: bytes, sig_header: str) -> Optional[Dict]:
+        """Non-blocking handle_webhook (runs on the webhook pool)"""
+        return await _run_in_executor(_WEBHOOK_EXECUTOR, self.handle_webhook, payload, sig_header)
 
     @staticmethod
     def format_price(amount_cents: int, currency: str = 'usd') -> str:
@@ -3,10 +3,14 @@ Telegram Bot Integration for Trade Notifications and Commands
 """
 
 import os
+import time
 import asyncio
 import logging
+import threading
+import importlib.util
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from telegram import Update, Bot
 from telegram.ext import (
     Application,
@@ -16,18 +20,234 @@ from telegram.ext import (
     filters
 )
 from telegram.constants import ParseMode
+from telegram.request import HTTPXRequest
 from dotenv import load_dotenv
 
+# uvloop is optional; the background sender loop uses it when installed
+try:
+    import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections available to the bot; the library default (1)
+# serializes concurrent sends
+_CONNECTION_POOL_SIZE = 16
+
+# HTTP/2 multiplexes concurrent sends over one connection (httpx needs h2)
+_HTTP_VERSION = '2' if importlib.util.find_spec('h2') else '1.1'
+
+# Telegram allows ~30 messages/s per bot; stay below it instead of hitting 429s
+_MAX_CONCURRENT_SENDS = 10
+_MAX_SENDS_PER_SECOND = 25
+
+# Messages batched by send_many are joined up to Telegram's length limit
+_MAX_MESSAGE_LEN = 4096
+_COALESCE_SEPARATOR = "\n\n────\n\n"
+
+# notify_* only enqueue; a worker on the background loop does the sending.
+# Alerts that need action go out before routine trade updates, and when the
+# queue is full the oldest routine message is dropped.
+_QUEUE_MAXSIZE = 1000
+_DRAIN_BATCH = _MAX_CONCURRENT_SENDS
+_PRIORITY_HIGH = 0
+_PRIORITY_NORMAL = 1
+
+
+def _telegram_len(text: str) -> int:
+    """Message length as Telegram counts it (UTF-16 code units)"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+_bg_loop: Optional[asyncio.AbstractEventLoop] = None
+_bg_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Event loop running in a daemon thread, shared by all sync senders"""
+    global _bg_loop
+    with _bg_loop_lock:
+        if _bg_loop is None:
+            loop = _new_event_loop()
+            threading.Thread(target=loop.run_forever, name='telegram-loop', daemon=True).start()
+            _bg_loop = loop
+    return _bg_loop
+
+
+def _midnight_after(ts: float) -> float:
+    """Epoch time of the next local midnight after ts"""
+    lt = time.localtime(ts)
+    # mktime normalizes day overflow (e.g. Jan 32 -> Feb 1) and DST
+    return time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+
+
+# Last formatted timestamp per format: {fmt: (epoch second, text)}
+_TS_CACHE: Dict[str, Tuple[int, str]] = {}
+
+
+def _now_str(fmt: str = '%Y-%m-%d %H:%M:%S') -> str:
+    """Current local time formatted for notifications (formatted once per second)"""
+    now = int(time.time())
+    cached = _TS_CACHE.get(fmt)
+    if cached is not None and cached[0] == now:
+        return cached[1]
+
+    text = time.strftime(fmt, time.localtime(now))
+    _TS_CACHE[fmt] = (now, text)
+    return text
+
 
 class TelegramNotifier:
     """
     Telegram bot for sending trading notifications and handling commands
     """
 
+    # ===== MESSAGE TEMPLATES (str.format_map) =====
+
+    _TRADE_ENTRY_TMPL = """
+{emoji} <b>NEW TRADE OPENED</b> {emoji}
+
+💰 <b>Symbol:</b> {symbol}
+📈 <b>Side:</b> {side}
+💵 <b>Entry:</b> ${entry_price:.4f}
+📊 <b>Quantity:</b> {quantity:.4f}
+⚡ <b>Leverage:</b> {leverage}x
+
+🎯 <b>Targets:</b>
+• TP1: ${take_profit_1:.4f}
+• SL: ${stop_loss:.4f}
+
+💸 <b>Risk:</b> ${risk_usd:.2f}
+
+⏰ {now}
+"""
+
+    _TAKE_PROFIT_TMPL = """
+🎯 <b>TAKE PROFIT HIT!</b> ✅
+
+💰 <b>Symbol:</b> {symbol}
+🎯 <b>TP{tp_level}:</b> ${price:.4f}
+📊 <b>Closed:</b> {quantity_closed:.4f}
+
+💵 <b>Profit:</b> ${profit:.2f} ({percentage:+.2f}%)
+
+⏰ {now}
+"""
+
+    _STOP_LOSS_TMPL = """
+🛑 <b>STOP LOSS HIT</b> ⚠️
+
+💰 <b>Symbol:</b> {symbol}
+🔴 <b>Exit:</b> ${price:.4f}
+📉 <b>Loss:</b> ${loss:.2f} ({percentage:.2f}%)
+❌ <b>Reason:</b> {reason}
+
+⏰ {now}
+"""
+
+    _TRADE_CLOSED_TMPL = """
+{emoji} <b>TRADE CLOSED</b>
+
+💰 <b>Symbol:</b> {symbol}
+💵 <b>Exit:</b> ${price:.4f}
+📊 <b>P&L:</b> ${pnl:.2f} ({percentage:+.2f}%)
+ℹ️ <b>Reason:</b> {reason}
+
+⏰ {now}
+"""
+
+    _RISK_WARNING_TMPL = """
+{emoji} <b>RISK WARNING</b> {emoji}
+
+⚡ <b>Type:</b> {type}
+📝 <b>Message:</b> {message}
+
+⏰ {now}
+"""
+
+    _DAILY_LOSS_LIMIT_TMPL = """
+🚨 <b>DAILY LOSS LIMIT REACHED!</b> 🚨
+
+📉 <b>Drawdown:</b> {drawdown:.2f}%
+🛑 <b>Limit:</b> {limit:.2f}%
+
+⚠️ <b>Trading paused for today</b>
+✅ Will resume tomorrow
+
+⏰ {now}
+"""
+
+    _MAX_DRAWDOWN_TMPL = """
+🚨🚨 <b>MAX DRAWDOWN ALERT!</b> 🚨🚨
+
+📉 <b>Total Drawdown:</b> {drawdown:.2f}%
+🛑 <b>Limit:</b> {limit:.2f}%
+
+⚠️ <b>BOT STOPPED - IMMEDIATE ACTION REQUIRED!</b>
+
+Please review your strategy and risk settings.
+
+⏰ {now}
+"""
+
+    _CONSECUTIVE_LOSSES_TMPL = """
+⚠️ <b>COOLDOWN ACTIVATED</b>
+
+📉 <b>Consecutive Losses:</b> {losses}
+⏸️ <b>Cooldown:</b> {cooldown_hours} hours
+
+Bot will pause trading to protect capital.
+
+⏰ {now}
+"""
+
+    _DAILY_SUMMARY_TMPL = """
+{emoji} <b>DAILY SUMMARY</b> {emoji}
+<i>{date}</i>
+
+📊 <b>Performance:</b>
+• Total Trades: {trades}
+• Wins: {wins} ✅
+• Losses: {losses} ❌
+• Win Rate: {win_rate:.1f}%
+
+💰 <b>P&L:</b>
+• Daily P&L: ${pnl:+.2f}
+{balance_line}
+
+⏰ {time}
+"""
+
+    _BOT_STARTED_TMPL = """
+🚀 <b>BOT STARTED</b>
+
+Trading bot is now running and scanning markets.
+
+⏰ {now}
+"""
+
+    _BOT_STOPPED_TMPL = """
+🛑 <b>BOT STOPPED</b>
+
+Reason: {reason}
+
+⏰ {now}
+"""
+
+    _ERROR_TMPL = """
+❌ <b>ERROR OCCURRED</b>
+
+{error_msg}
+
+Check logs for details.
+
+⏰ {now}
+"""
+
     def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None):
         """Initialize Telegram notifier"""
         self.bot_token = bot_token or os.getenv('TELEGRAM_BOT_TOKEN')
@@ -38,11 +258,31 @@ class TelegramNotifier:
         self.enabled = bool(self.bot_token and self.chat_id)
 
         if self.enabled:
-            self.bot = Bot(token=self.bot_token)
+            self.bot = Bot(
+                token=self.bot_token,
+                request=HTTPXRequest(
+                    connection_pool_size=_CONNECTION_POOL_SIZE,
+                    http_version=_HTTP_VERSION
+                )
+            )
             logger.info("✅ Telegram notifications enabled")
         else:
             logger.warning("⚠️  Telegram notifications disabled (missing credentials)")
 
+        # Outgoing rate limiting (created on the background loop on first send)
+        self._send_sem: Optional[asyncio.Semaphore] = None
+        self._send_times = deque()
+
+        # Sends that raised, for callers checking delivery after flush()
+        self.failed_sends = 0
+
+        # Fire-and-forget notification queue (one deque per priority),
+        # only touched from the background loop
+        self._queues = (deque(), deque())
+        self._queue_idle = asyncio.Event()
+        self._queue_idle.set()
+        self._drain_task: Optional[asyncio.Task] = None
+
         # Stats tracking
         self.daily_stats = {
             'trades': 0,
@@ -51,51 +291,184 @@ class TelegramNotifier:
             'pnl': 0.0,
             'last_reset': datetime.now().date()
         }
+        self._next_reset_epoch = _midnight_after(time.time())
 
     def _reset_daily_stats_if_needed(self):
         """Reset daily stats at midnight"""
-        today = datetime.now().date()
-        if self.daily_stats['last_reset'] != today:
+        now = time.time()
+        if now >= self._next_reset_epoch:
             self.daily_stats = {
                 'trades': 0,
                 'wins': 0,
                 'losses': 0,
                 'pnl': 0.0,
-                'last_reset': today
+                'last_reset': datetime.now().date()
             }
+            self._next_reset_epoch = _midnight_after(now)
 
     async def send_message(self, message: str, parse_mode: str = ParseMode.HTML):
-        """Send a message to Telegram"""
+        """
+        Send a message to Telegram
+
+        Can be awaited from any event loop: self.bot (its connection pool)
+        is only ever used on the background loop, so calls from other loops
+        are handed over to it.
+        """
         if not self.enabled:
             logger.debug(f"Telegram disabled, message not sent: {message}")
             return False
 
+        loop = _background_loop()
+        if asyncio.get_running_loop() is loop:
+            return await self._send(message, parse_mode)
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._send(message, parse_mode), loop)
+        )
+
+    async def _send(self, message: str, parse_mode: str = ParseMode.HTML) -> bool:
+        """Send one message (runs on the background loop only)"""
+        if self._send_sem is None:
+            self._send_sem = asyncio.Semaphore(_MAX_CONCURRENT_SENDS)
+
         try:
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode=parse_mode
-            )
+            async with self._send_sem:
+                await self._wait_for_rate_limit()
+                await self.bot.send_message(
+                    chat_id=self.chat_id,
+                    text=message,
+                    parse_mode=parse_mode
+                )
             logger.debug(f"✅ Telegram message sent: {message[:50]}...")
             return True
         except Exception as e:
+            self.failed_sends += 1
             logger.error(f"❌ Failed to send Telegram message: {e}")
             return False
 
+    async def _wait_for_rate_limit(self):
+        """Sleep until another send fits in the rolling one-second window"""
+        times = self._send_times
+        while True:
+            now = time.monotonic()
+            while times and now - times[0] >= 1.0:
+                times.popleft()
+            if len(times) < _MAX_SENDS_PER_SECOND:
+                times.append(now)
+                return
+            await asyncio.sleep(1.0 - (now - times[0]))
+
+    @staticmethod
+    def _coalesce(messages: List[str]) -> List[Tuple[str, int]]:
+        """
+        Join consecutive messages while they fit in one Telegram message
+
+        Returns:
+            (text, number of original messages in it) per outgoing message
+        """
+        batches = []
+        for message in messages:
+            if batches:
+                text, count = batches[-1]
+                joined = text + _COALESCE_SEPARATOR + message
+                if _telegram_len(joined) <= _MAX_MESSAGE_LEN:
+                    batches[-1] = (joined, count + 1)
+                    continue
+            batches.append((message, 1))
+        return batches
+
+    async def send_many(self, messages: List[str], parse_mode: str = ParseMode.HTML) -> List[bool]:
+        """
+        Send several independent messages with as few requests as possible
+
+        Consecutive messages are merged up to Telegram's length limit and
+        the resulting requests are sent concurrently on the pooled
+        connections. Delivery order between requests is not guaranteed.
+
+        Returns:
+            Success flag per original message
+        """
+        batches = self._coalesce(messages)
+        results = await asyncio.gather(
+            *(self.send_message(text, parse_mode) for text, _ in batches)
+        )
+        return [ok for ok, (_, count) in zip(results, batches) for _ in range(count)]
+
     def send_message_sync(self, message: str):
-        """Synchronous wrapper for send_message"""
+        """
+        Synchronous wrapper for send_message
+
+        The message is sent on a shared background event loop, so sync
+        callers neither block on Telegram nor pay for a new loop per message.
+
+        Returns:
+            concurrent.futures.Future resolving to send_message's result,
+            or False if Telegram is disabled
+        """
         if not self.enabled:
             return False
 
+        return asyncio.run_coroutine_threadsafe(
+            self._send(message), _background_loop()
+        )
+
+    def _queue_message(self, message: str, priority: int = _PRIORITY_NORMAL):
+        """Hand a notification to the background sender without waiting on Telegram"""
+        if not self.enabled:
+            logger.debug(f"Telegram disabled, message not sent: {message}")
+            return
+
+        _background_loop().call_soon_threadsafe(self._enqueue, message, priority)
+
+    def _enqueue(self, message: str, priority: int):
+        """Add a message to the queue (runs on the background loop)"""
+        high, normal = self._queues
+        if len(high) + len(normal) >= _QUEUE_MAXSIZE:
+            (normal or high).popleft()
+            logger.warning("⚠️  Telegram queue full, dropped oldest notification")
+
+        self._queues[priority].append(message)
+        self._queue_idle.clear()
+
+        if self._drain_task is None:
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self):
+        """Send queued notifications, high priority first, in concurrent batches"""
+        high, normal = self._queues
+        while high or normal:
+            batch = []
+            while len(batch) < _DRAIN_BATCH and (high or normal):
+                batch.append((high or normal).popleft())
+
+            await asyncio.gather(*(self._send(message) for message in batch))
+
+        # Queue empty: exit, _enqueue starts a new worker when needed
+        self._drain_task = None
+        self._queue_idle.set()
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued notification has been sent
+
+        Short-lived scripts should call this before their event loop exits.
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if the queue drained in time
+        """
+        if not self.enabled:
+            return True
+
+        # Scheduled after any pending _enqueue callbacks, so it sees them
+        future = asyncio.run_coroutine_threadsafe(
+            asyncio.wait_for(self._queue_idle.wait(), timeout), _background_loop()
+        )
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(self.send_message(message))
-            else:
-                loop.run_until_complete(self.send_message(message))
+            await asyncio.wrap_future(future)
             return True
-        except Exception as e:
-            logger.error(f"❌ Error in sync send: {e}")
+        except asyncio.TimeoutError:
             return False
 
     # ===========================================
@@ -106,104 +479,70 @@ class TelegramNotifier:
         """Notify when a trade is opened"""
         self._reset_daily_stats_if_needed()
 
-        symbol = trade_data.get('symbol', 'UNKNOWN')
         side = trade_data.get('side', 'LONG').upper()
-        entry_price = trade_data.get('entry_price', 0)
-        quantity = trade_data.get('quantity', 0)
-        stop_loss = trade_data.get('stop_loss', 0)
-        take_profit_1 = trade_data.get('take_profit_1', 0)
-        leverage = trade_data.get('leverage', 1)
-        risk_usd = trade_data.get('risk_usd', 0)
-
-        emoji = "🟢" if side == "LONG" else "🔴"
-
-        message = f"""
-{emoji} <b>NEW TRADE OPENED</b> {emoji}
-
-💰 <b>Symbol:</b> {symbol}
-📈 <b>Side:</b> {side}
-💵 <b>Entry:</b> ${entry_price:.4f}
-📊 <b>Quantity:</b> {quantity:.4f}
-⚡ <b>Leverage:</b> {leverage}x
 
-🎯 <b>Targets:</b>
-• TP1: ${take_profit_1:.4f}
-• SL: ${stop_loss:.4f}
-
-💸 <b>Risk:</b> ${risk_usd:.2f}
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._TRADE_ENTRY_TMPL.format_map({
+            'emoji': "🟢" if side == "LONG" else "🔴",
+            'symbol': trade_data.get('symbol', 'UNKNOWN'),
+            'side': side,
+            'entry_price': trade_data.get('entry_price', 0),
+            'quantity': trade_data.get('quantity', 0),
+            'stop_loss': trade_data.get('stop_loss', 0),
+            'take_profit_1': trade_data.get('take_profit_1', 0),
+            'leverage': trade_data.get('leverage', 1),
+            'risk_usd': trade_data.get('risk_usd', 0),
+            'now': _now_str(),
+        })
+        self._queue_message(message)
         self.daily_stats['trades'] += 1
 
     async def notify_take_profit(self, tp_data: Dict[str, Any]):
         """Notify when take profit is hit"""
-        symbol = tp_data.get('symbol', 'UNKNOWN')
-        tp_level = tp_data.get('tp_level', 1)
-        price = tp_data.get('price', 0)
-        quantity_closed = tp_data.get('quantity_closed', 0)
         profit = tp_data.get('profit', 0)
-        percentage = tp_data.get('percentage', 0)
-
-        message = f"""
-🎯 <b>TAKE PROFIT HIT!</b> ✅
 
-💰 <b>Symbol:</b> {symbol}
-🎯 <b>TP{tp_level}:</b> ${price:.4f}
-📊 <b>Closed:</b> {quantity_closed:.4f}
-
-💵 <b>Profit:</b> ${profit:.2f} ({percentage:+.2f}%)
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._TAKE_PROFIT_TMPL.format_map({
+            'symbol': tp_data.get('symbol', 'UNKNOWN'),
+            'tp_level': tp_data.get('tp_level', 1),
+            'price': tp_data.get('price', 0),
+            'quantity_closed': tp_data.get('quantity_closed', 0),
+            'profit': profit,
+            'percentage': tp_data.get('percentage', 0),
+            'now': _now_str(),
+        })
+        self._queue_message(message)
         self.daily_stats['wins'] += 1
         self.daily_stats['pnl'] += profit
 
     async def notify_stop_loss(self, sl_data: Dict[str, Any]):
         """Notify when stop loss is hit"""
-        symbol = sl_data.get('symbol', 'UNKNOWN')
-        price = sl_data.get('price', 0)
         loss = sl_data.get('loss', 0)
-        percentage = sl_data.get('percentage', 0)
-        reason = sl_data.get('reason', 'Stop Loss')
-
-        message = f"""
-🛑 <b>STOP LOSS HIT</b> ⚠️
 
-💰 <b>Symbol:</b> {symbol}
-🔴 <b>Exit:</b> ${price:.4f}
-📉 <b>Loss:</b> ${loss:.2f} ({percentage:.2f}%)
-❌ <b>Reason:</b> {reason}
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._STOP_LOSS_TMPL.format_map({
+            'symbol': sl_data.get('symbol', 'UNKNOWN'),
+            'price': sl_data.get('price', 0),
+            'loss': loss,
+            'percentage': sl_data.get('percentage', 0),
+            'reason': sl_data.get('reason', 'Stop Loss'),
+            'now': _now_str(),
+        })
+        self._queue_message(message, _PRIORITY_HIGH)
         self.daily_stats['losses'] += 1
         self.daily_stats['pnl'] += loss
 
     async def notify_trade_closed(self, close_data: Dict[str, Any]):
         """Notify when trade is manually closed"""
-        symbol = close_data.get('symbol', 'UNKNOWN')
-        price = close_data.get('price', 0)
         pnl = close_data.get('pnl', 0)
-        percentage = close_data.get('percentage', 0)
-        reason = close_data.get('reason', 'Manual Close')
 
-        emoji = "✅" if pnl >= 0 else "❌"
-
-        message = f"""
-{emoji} <b>TRADE CLOSED</b>
-
-💰 <b>Symbol:</b> {symbol}
-💵 <b>Exit:</b> ${price:.4f}
-📊 <b>P&L:</b> ${pnl:.2f} ({percentage:+.2f}%)
-ℹ️ <b>Reason:</b> {reason}
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._TRADE_CLOSED_TMPL.format_map({
+            'emoji': "✅" if pnl >= 0 else "❌",
+            'symbol': close_data.get('symbol', 'UNKNOWN'),
+            'price': close_data.get('price', 0),
+            'pnl': pnl,
+            'percentage': close_data.get('percentage', 0),
+            'reason': close_data.get('reason', 'Manual Close'),
+            'now': _now_str(),
+        })
+        self._queue_message(message)
 
         if pnl >= 0:
             self.daily_stats['wins'] += 1
@@ -217,66 +556,36 @@ class TelegramNotifier:
 
     async def notify_risk_warning(self, warning_data: Dict[str, Any]):
         """Send risk management warnings"""
-        warning_type = warning_data.get('type', 'UNKNOWN')
-        message_text = warning_data.get('message', '')
         severity = warning_data.get('severity', 'warning')
 
-        emoji = "🚨" if severity == "critical" else "⚠️"
-
-        message = f"""
-{emoji} <b>RISK WARNING</b> {emoji}
-
-⚡ <b>Type:</b> {warning_type}
-📝 <b>Message:</b> {message_text}
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._RISK_WARNING_TMPL.format_map({
+            'emoji': "🚨" if severity == "critical" else "⚠️",
+            'type': warning_data.get('type', 'UNKNOWN'),
+            'message': warning_data.get('message', ''),
+            'now': _now_str(),
+        })
+        self._queue_message(message, _PRIORITY_HIGH if severity == "critical" else _PRIORITY_NORMAL)
 
     async def notify_daily_loss_limit(self, drawdown: float, limit: float):
         """Notify when daily loss limit is reached"""
-        message = f"""
-🚨 <b>DAILY LOSS LIMIT REACHED!</b> 🚨
-
-📉 <b>Drawdown:</b> {drawdown:.2f}%
-🛑 <b>Limit:</b> {limit:.2f}%
-
-⚠️ <b>Trading paused for today</b>
-✅ Will resume tomorrow
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._DAILY_LOSS_LIMIT_TMPL.format_map({
+            'drawdown': drawdown, 'limit': limit, 'now': _now_str()
+        })
+        self._queue_message(message, _PRIORITY_HIGH)
 
     async def notify_max_drawdown(self, drawdown: float, limit: float):
         """Notify when max drawdown is reached"""
-        message = f"""
-🚨🚨 <b>MAX DRAWDOWN ALERT!</b> 🚨🚨
-
-📉 <b>Total Drawdown:</b> {drawdown:.2f}%
-🛑 <b>Limit:</b> {limit:.2f}%
-
-⚠️ <b>BOT STOPPED - IMMEDIATE ACTION REQUIRED!</b>
-
-Please review your strategy and risk settings.
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._MAX_DRAWDOWN_TMPL.format_map({
+            'drawdown': drawdown, 'limit': limit, 'now': _now_str()
+        })
+        self._queue_message(message, _PRIORITY_HIGH)
 
     async def notify_consecutive_losses(self, losses: int, cooldown_hours: int):
         """Notify about consecutive losses cooldown"""
-        message = f"""
-⚠️ <b>COOLDOWN ACTIVATED</b>
-
-📉 <b>Consecutive Losses:</b> {losses}
-⏸️ <b>Cooldown:</b> {cooldown_hours} hours
-
-Bot will pause trading to protect capital.
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._CONSECUTIVE_LOSSES_TMPL.format_map({
+            'losses': losses, 'cooldown_hours': cooldown_hours, 'now': _now_str()
+        })
+        self._queue_message(message, _PRIORITY_HIGH)
 
     # ===========================================
     # DAILY SUMMARY
@@ -301,25 +610,18 @@ Bot will pause trading to protect capital.
             win_rate = (wins / trades * 100) if trades > 0 else 0
             balance = 0
 
-        emoji = "📈" if pnl >= 0 else "📉"
-
-        message = f"""
-{emoji} <b>DAILY SUMMARY</b> {emoji}
-<i>{datetime.now().strftime('%Y-%m-%d')}</i>
-
-📊 <b>Performance:</b>
-• Total Trades: {trades}
-• Wins: {wins} ✅
-• Losses: {losses} ❌
-• Win Rate: {win_rate:.1f}%
-
-💰 <b>P&L:</b>
-• Daily P&L: ${pnl:+.2f}
-{f'• Balance: ${balance:.2f}' if balance > 0 else ''}
-
-⏰ {datetime.now().strftime('%H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._DAILY_SUMMARY_TMPL.format_map({
+            'emoji': "📈" if pnl >= 0 else "📉",
+            'date': _now_str('%Y-%m-%d'),
+            'trades': trades,
+            'wins': wins,
+            'losses': losses,
+            'win_rate': win_rate,
+            'pnl': pnl,
+            'balance_line': f'• Balance: ${balance:.2f}' if balance > 0 else '',
+            'time': _now_str('%H:%M:%S'),
+        })
+        self._queue_message(message)
 
     # ===========================================
     # BOT COMMANDS
@@ -476,38 +778,18 @@ Use /pause to stop trading.
 
     async def notify_bot_started(self):
         """Notify when bot starts"""
-        message = """
-🚀 <b>BOT STARTED</b>
-
-Trading bot is now running and scanning markets.
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._BOT_STARTED_TMPL.format_map({'now': _now_str()})
+        self._queue_message(message)
 
     async def notify_bot_stopped(self, reason: str = "Manual stop"):
         """Notify when bot stops"""
-        message = f"""
-🛑 <b>BOT STOPPED</b>
-
-Reason: {reason}
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._BOT_STOPPED_TMPL.format_map({'reason': reason, 'now': _now_str()})
+        self._queue_message(message, _PRIORITY_HIGH)
 
     async def notify_error(self, error_msg: str):
         """Notify about system errors"""
-        message = f"""
-❌ <b>ERROR OCCURRED</b>
-
-{error_msg}
-
-Check logs for details.
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        await self.send_message(message)
+        message = self._ERROR_TMPL.format_map({'error_msg': error_msg, 'now': _now_str()})
+        self._queue_message(message, _PRIORITY_HIGH)
 
 
 # ===========================================
@@ -536,9 +818,10 @@ if __name__ == "__main__":
     # Test notifications
     notifier = TelegramNotifier()
 
-    if notifier.enabled:
-        # Test trade entry
-        asyncio.run(notifier.notify_trade_entry({
+    async def test_trade_entry() -> bool:
+        """Queue a trade entry notification and wait until it has gone out"""
+        failed = notifier.failed_sends
+        await notifier.notify_trade_entry({
             'symbol': 'BNBUSDT',
             'side': 'LONG',
             'entry_price': 245.30,
@@ -547,8 +830,15 @@ if __name__ == "__main__":
             'take_profit_1': 250.00,
             'leverage': 5,
             'risk_usd': 50.00
-        }))
+        })
+        # notify_* only queue - the background sender dies with the process
+        return await notifier.flush(timeout=15) and notifier.failed_sends == failed
 
-        print("✅ Test notification sent!")
+    if notifier.enabled:
+        # Test trade entry
+        if asyncio.run(test_trade_entry()):
+            print("✅ Test notification sent!")
+        else:
+            print("❌ Test notification failed - check the logs")
     else:
         print("❌ Telegram not configured")
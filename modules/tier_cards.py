@@ -0,0 +1,47 @@
+"""
+Tier Cards
+Plan/feature blurbs shown on the login and signup pages
+"""
+
+# (title, markdown list) per plan - signup page "Choose Your Plan"
+TIER_CARDS = (
+    ("FREE", """
+- $0/month
+- 1 trade/day
+- Paper trading
+- BTC/USDT only
+- Community support
+"""),
+    ("PRO ⭐", """
+- $99/month
+- 20 trades/day
+- Live trading
+- 5 pairs
+- Priority support
+- Backtesting
+"""),
+    ("PREMIUM 💎", """
+- $249/month
+- Unlimited trades
+- Multi-exchange
+- All pairs
+- VIP support
+- API access
+"""),
+)
+
+# Login page "Features"
+TIER_FEATURE_CARDS = (
+    ("FREE Tier:", """
+- ✅ 1 trade/day
+- ✅ Paper trading
+- ✅ BTC/USDT only
+- ✅ Basic signals
+"""),
+    ("PRO Tier:", """
+- 🔥 20 trades/day
+- 🔥 Live trading
+- 🔥 5 trading pairs
+- 🔥 Advanced strategies
+"""),
+)
@@ -5,9 +5,17 @@ Integrates with License State for automatic tier detection
 """
 
 import logging
-from typing import Dict, Tuple, Optional
+import numpy as np
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, Optional
 from enum import Enum
 
+# License auto-detection is optional (TierManager works without it)
+try:
+    from .license_state import get_license_state as _get_license_state
+except ImportError:
+    _get_license_state = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +27,23 @@ class TierLevel(Enum):
     ENTERPRISE = "enterprise"
 
 
+# Tier hierarchy: FREE < PRO < PREMIUM < ENTERPRISE
+_TIER_RANK = {
+    TierLevel.FREE: 0,
+    TierLevel.PRO: 1,
+    TierLevel.PREMIUM: 2,
+    TierLevel.ENTERPRISE: 3
+}
+
+# Tier to advertise in upsell messages
+_NEXT_TIER = {
+    TierLevel.FREE: "PRO",
+    TierLevel.PRO: "PREMIUM",
+    TierLevel.PREMIUM: "ENTERPRISE",
+    TierLevel.ENTERPRISE: "ENTERPRISE"
+}
+
+
 class TierManager:
     """
     Manages tier-based feature access and limitations
@@ -36,27 +61,87 @@ class TierManager:
             auto_detect_license: Automatically detect tier from activated license
         """
         # Auto-detect tier from license if enabled
-        if auto_detect_license:
+        if auto_detect_license and _get_license_state is not None:
             try:
-                from .license_state import get_license_state
-                license_state = get_license_state()
+                license_state = _get_license_state()
                 detected_tier = license_state.get_current_tier()
                 if detected_tier:
                     user_tier = detected_tier
-                    logger.info(f"🔑 License detected: {detected_tier.upper()}")
+                    logger.info("🔑 License detected: %s", detected_tier.upper())
             except Exception as e:
-                logger.warning(f"⚠️ Could not detect license tier: {e}. Using default: {user_tier}")
+                logger.warning("⚠️ Could not detect license tier: %s. Using default: %s", e, user_tier)
 
         self.tier_config = tier_config
         self.user_tier = TierLevel(user_tier)
         self.current_tier_config = tier_config['tiers'][user_tier]
+        self._user_rank = _TIER_RANK[self.user_tier]
+        self._next_tier = _NEXT_TIER[self.user_tier]
+        self._features = self.current_tier_config['features']
+
+        # Feature gates resolved once: {feature: (required rank, error message)}
+        self._gate_rank = {
+            feature: (_TIER_RANK[TierLevel(gate['required_tier'])], gate['error_message'])
+            for feature, gate in tier_config.get('feature_gates', {}).items()
+        }
+
+        # Allowed pairs/leverage/strategies as sets ("all" -> None = unrestricted)
+        features = self._features
+        pairs = features['available_pairs']
+        strategies = features['available_strategies']
+        self._pairs_set = None if pairs == "all" else frozenset(pairs)
+        self._leverage_set = frozenset(features['available_leverage'])
+        self._strategies_set = None if strategies == "all" else frozenset(strategies)
+
+        # Upsell text for the pair/leverage messages
+        self._pairs_text = None if pairs == "all" else ', '.join(pairs)
+        self._leverage_text = str(features['available_leverage'])
+
+        # No size/count/pair/strategy limits at all (only leverage left to check)
+        self._all_unlimited = (
+            features['max_position_size_usd'] == -1
+            and features['max_daily_trades'] == -1
+            and features['max_concurrent_positions'] == -1
+            and self._pairs_set is None
+            and self._strategies_set is None
+        )
+
+        # Read-only views handed out by get_tier_features / get_stats
+        self._features_view = MappingProxyType(features)
+        self._stats_snapshot = MappingProxyType({
+            'tier': self.user_tier.value,
+            'tier_name': self.current_tier_config['name'],
+            'price': self.current_tier_config['price'],
+            'live_trading_enabled': features['live_trading'],
+            'max_position_size': features['max_position_size_usd'],
+            'max_daily_trades': features['max_daily_trades'],
+            'max_concurrent_positions': features['max_concurrent_positions'],
+            'available_pairs': pairs if isinstance(pairs, list) else 'all',
+            'next_tier': self._next_tier
+        })
 
-        logger.info(f"🎫 Tier Manager initialized: {self.user_tier.value.upper()}")
+        logger.info("🎫 Tier Manager initialized: %s", self.user_tier.value.upper())
         self._log_tier_features()
 
+    @classmethod
+    def for_license(cls, tier_config: Dict, tier: str) -> "TierManager":
+        """
+        Create a Tier Manager for an already known tier (skips license detection)
+
+        Args:
+            tier_config: Tier configuration dictionary
+            tier: User tier, e.g. from LicenseState.get_current_tier()
+
+        Returns:
+            TierManager instance
+        """
+        return cls(tier_config, tier, auto_detect_license=False)
+
     def _log_tier_features(self):
         """Log user's current tier features"""
-        features = self.current_tier_config['features']
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
+        features = self._features
         logger.info("=" * 60)
         logger.info(f"TIER: {self.current_tier_config['name']} (${self.current_tier_config['price']}/mo)")
         logger.info("=" * 60)
@@ -77,40 +162,29 @@ class TierManager:
         Returns:
             (can_access, error_message)
         """
-        feature_gates = self.tier_config['feature_gates']
-
-        if feature in feature_gates:
-            required_tier = TierLevel(feature_gates[feature]['required_tier'])
-
-            # Check tier hierarchy: FREE < PRO < PREMIUM < ENTERPRISE
-            tier_hierarchy = {
-                TierLevel.FREE: 0,
-                TierLevel.PRO: 1,
-                TierLevel.PREMIUM: 2,
-                TierLevel.ENTERPRISE: 3
-            }
+        gate = self._gate_rank.get(feature)
 
-            if tier_hierarchy[self.user_tier] < tier_hierarchy[required_tier]:
-                error_msg = feature_gates[feature]['error_message']
-                logger.warning(f"🚫 Feature '{feature}' blocked: {error_msg}")
-                return False, error_msg
+        if gate is not None and self._user_rank < gate[0]:
+            error_msg = gate[1]
+            logger.warning("🚫 Feature '%s' blocked: %s", feature, error_msg)
+            return False, error_msg
 
         return True, ""
 
     def check_live_trading_allowed(self) -> Tuple[bool, str]:
         """Check if user can use live trading"""
-        features = self.current_tier_config['features']
+        features = self._features
 
         if not features['live_trading']:
             msg = "Live trading requires PRO tier. Upgrade to start trading with real money! 💰"
-            logger.warning(f"🚫 {msg}")
+            logger.warning("🚫 %s", msg)
             return False, msg
 
         return True, ""
 
     def check_position_size_limit(self, position_value_usd: float) -> Tuple[bool, str]:
         """Check if position size is within tier limits"""
-        features = self.current_tier_config['features']
+        features = self._features
         max_size = features['max_position_size_usd']
 
         # -1 means unlimited
@@ -119,14 +193,14 @@ class TierManager:
 
         if position_value_usd > max_size:
             msg = f"Position size ${position_value_usd:.0f} exceeds {self.user_tier.value.upper()} limit of ${max_size}. Upgrade for higher limits! 📈"
-            logger.warning(f"🚫 {msg}")
+            logger.warning("🚫 %s", msg)
             return False, msg
 
         return True, ""
 
     def check_daily_trades_limit(self, current_daily_trades: int) -> Tuple[bool, str]:
         """Check if daily trade limit reached"""
-        features = self.current_tier_config['features']
+        features = self._features
         max_trades = features['max_daily_trades']
 
         # -1 means unlimited
@@ -134,15 +208,15 @@ class TierManager:
             return True, ""
 
         if current_daily_trades >= max_trades:
-            msg = f"Daily trade limit reached ({max_trades}). Upgrade to {self.get_next_tier()} for more trades! 🚀"
-            logger.warning(f"🚫 {msg}")
+            msg = f"Daily trade limit reached ({max_trades}). Upgrade to {self._next_tier} for more trades! 🚀"
+            logger.warning("🚫 %s", msg)
             return False, msg
 
         return True, ""
 
     def check_concurrent_positions_limit(self, current_positions: int) -> Tuple[bool, str]:
         """Check if concurrent positions limit reached"""
-        features = self.current_tier_config['features']
+        features = self._features
         max_positions = features['max_concurrent_positions']
 
         # -1 means unlimited
@@ -151,72 +225,61 @@ class TierManager:
 
         if current_positions >= max_positions:
             msg = f"Max concurrent positions reached ({max_positions}). Upgrade to manage more positions! 💪"
-            logger.warning(f"🚫 {msg}")
+            logger.warning("🚫 %s", msg)
             return False, msg
 
         return True, ""
 
     def check_trading_pair_allowed(self, pair: str) -> Tuple[bool, str]:
         """Check if trading pair is allowed in current tier"""
-        features = self.current_tier_config['features']
-        available_pairs = features['available_pairs']
+        available_pairs = self._pairs_set
 
-        # "all" means all pairs allowed
-        if available_pairs == "all":
+        # None means all pairs allowed
+        if available_pairs is None:
             return True, ""
 
         if pair not in available_pairs:
-            msg = f"Pair {pair} not available in {self.user_tier.value.upper()} tier. Available: {', '.join(available_pairs)}. Upgrade for more pairs! 🎯"
-            logger.warning(f"🚫 {msg}")
+            msg = f"Pair {pair} not available in {self.user_tier.value.upper()} tier. Available: {self._pairs_text}. Upgrade for more pairs! 🎯"
+            logger.warning("🚫 %s", msg)
             return False, msg
 
         return True, ""
 
     def check_leverage_allowed(self, leverage: int) -> Tuple[bool, str]:
         """Check if leverage is allowed in current tier"""
-        features = self.current_tier_config['features']
-        available_leverage = features['available_leverage']
-
-        if leverage not in available_leverage:
-            msg = f"Leverage {leverage}x not available in {self.user_tier.value.upper()} tier. Available: {available_leverage}. Upgrade for higher leverage! ⚡"
-            logger.warning(f"🚫 {msg}")
+        if leverage not in self._leverage_set:
+            msg = f"Leverage {leverage}x not available in {self.user_tier.value.upper()} tier. Available: {self._leverage_text}. Upgrade for higher leverage! ⚡"
+            logger.warning("🚫 %s", msg)
             return False, msg
 
         return True, ""
 
     def check_strategy_allowed(self, strategy: str) -> Tuple[bool, str]:
         """Check if strategy is available in current tier"""
-        features = self.current_tier_config['features']
-        available_strategies = features['available_strategies']
+        available_strategies = self._strategies_set
 
-        # "all" means all strategies allowed
-        if available_strategies == "all":
+        # None means all strategies allowed
+        if available_strategies is None:
             return True, ""
 
         if strategy not in available_strategies:
             msg = f"Strategy '{strategy}' is a PRO/PREMIUM feature. Upgrade to access advanced strategies! 🎓"
-            logger.warning(f"🚫 {msg}")
+            logger.warning("🚫 %s", msg)
             return False, msg
 
         return True, ""
 
     def get_next_tier(self) -> str:
         """Get next tier for upsell messaging"""
-        if self.user_tier == TierLevel.FREE:
-            return "PRO"
-        elif self.user_tier == TierLevel.PRO:
-            return "PREMIUM"
-        elif self.user_tier == TierLevel.PREMIUM:
-            return "ENTERPRISE"
-        return "PREMIUM"
+        return self._next_tier
 
     def get_upsell_message(self) -> str:
         """Get tier-specific upsell message"""
         return self.current_tier_config.get('upsell_message', '')
 
-    def get_tier_features(self) -> Dict:
-        """Get all features for current tier"""
-        return self.current_tier_config['features']
+    def get_tier_features(self) -> Mapping:
+        """Get all features for current tier (read-only)"""
+        return self._features_view
 
     def should_show_trial_offer(self) -> Tuple[bool, Dict]:
         """
@@ -236,42 +299,32 @@ class TierManager:
 
     def log_conversion_opportunity(self, trigger: str):
         """Log conversion opportunity for analytics"""
-        logger.info(f"💰 CONVERSION OPPORTUNITY: {trigger} (Current tier: {self.user_tier.value})")
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
+        logger.info("💰 CONVERSION OPPORTUNITY: %s (Current tier: %s)", trigger, self.user_tier.value)
 
         # Get appropriate trial offer
         should_show, trial = self.should_show_trial_offer()
 
         if should_show and trial.get('enabled'):
-            next_tier = self.get_next_tier()
-            logger.info(f"🎁 Trial available: {trial['duration_days']} days {next_tier} trial")
+            logger.info("🎁 Trial available: %s days %s trial", trial['duration_days'], self._next_tier)
 
     def get_max_daily_trades(self) -> int:
         """Get maximum daily trades for current tier"""
-        return self.current_tier_config['features']['max_daily_trades']
+        return self._features['max_daily_trades']
 
     def get_max_positions(self) -> int:
         """Get maximum concurrent positions for current tier"""
-        return self.current_tier_config['features']['max_concurrent_positions']
+        return self._features['max_concurrent_positions']
 
     def get_max_position_size(self) -> float:
         """Get maximum position size in USD for current tier"""
-        return self.current_tier_config['features']['max_position_size_usd']
+        return self._features['max_position_size_usd']
 
-    def get_stats(self) -> Dict:
-        """Get current tier statistics"""
-        features = self.current_tier_config['features']
-
-        return {
-            'tier': self.user_tier.value,
-            'tier_name': self.current_tier_config['name'],
-            'price': self.current_tier_config['price'],
-            'live_trading_enabled': features['live_trading'],
-            'max_position_size': features['max_position_size_usd'],
-            'max_daily_trades': features['max_daily_trades'],
-            'max_concurrent_positions': features['max_concurrent_positions'],
-            'available_pairs': features['available_pairs'] if isinstance(features['available_pairs'], list) else 'all',
-            'next_tier': self.get_next_tier()
-        }
+    def get_stats(self) -> Mapping:
+        """Get current tier statistics (read-only, built once at init)"""
+        return self._stats_snapshot
 
 
 class TierEnforcer:
@@ -299,6 +352,15 @@ class TierEnforcer:
         Returns:
             (is_valid, error_message)
         """
+        tier_manager = self.tier_manager
+
+        # Fast path: unlimited tier, only live access and leverage can fail
+        if tier_manager._all_unlimited and (not is_live or tier_manager._features['live_trading']):
+            allowed, msg = tier_manager.check_leverage_allowed(leverage)
+            if not allowed:
+                return False, msg
+            return True, "✅ All tier checks passed"
+
         # Check if live trading allowed
         if is_live:
             allowed, msg = self.tier_manager.check_live_trading_allowed()
@@ -343,3 +405,57 @@ class TierEnforcer:
             return False, msg
 
         return True, "✅ All tier checks passed"
+
+    def validate_trades(
+        self,
+        pairs: np.ndarray,
+        position_values_usd: np.ndarray,
+        leverages: np.ndarray,
+        strategies: np.ndarray,
+        is_live: bool
+    ) -> np.ndarray:
+        """
+        Vectorized tier validation for backtests and signal scans
+
+        Same checks as validate_trade_with_tier; the daily-trade and
+        concurrent-position limits use the risk manager's current counts
+        for every row. Nothing is logged.
+
+        Args:
+            pairs: Trading pair per candidate trade
+            position_values_usd: Position value per trade
+            leverages: Requested leverage per trade
+            strategies: Strategy name per trade
+            is_live: Whether the trades would be live
+
+        Returns:
+            Bool mask, True where the trade passes every tier check
+        """
+        tier_manager = self.tier_manager
+        features = tier_manager._features
+        mask = np.ones(len(pairs), dtype=bool)
+
+        if is_live and not features['live_trading']:
+            return ~mask
+
+        max_trades = features['max_daily_trades']
+        if max_trades != -1 and self.risk_manager.daily_trades >= max_trades:
+            return ~mask
+
+        max_positions = features['max_concurrent_positions']
+        if max_positions != -1 and self.risk_manager.open_positions >= max_positions:
+            return ~mask
+
+        max_size = features['max_position_size_usd']
+        if max_size != -1:
+            mask &= np.asarray(position_values_usd, dtype=np.float64) <= max_size
+
+        mask &= np.isin(leverages, list(tier_manager._leverage_set))
+
+        if tier_manager._pairs_set is not None:
+            mask &= np.isin(pairs, list(tier_manager._pairs_set))
+
+        if tier_manager._strategies_set is not None:
+            mask &= np.isin(strategies, list(tier_manager._strategies_set))
+
+        return mask
@@ -3,14 +3,137 @@ User Management System
 Handles user registration, authentication, and profile management
 """
 
+import re
 import sqlite3
 import bcrypt
+import hashlib
 import secrets
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Tuple
 import os
 from pathlib import Path
 
+# Basic email format check used at registration (length-capped per RFC 5321
+# before the regex runs, which bounds its backtracking)
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+EMAIL_MAX_LENGTH = 254
+
+# Columns returned by the get_user_by_* lookups (no password or API secrets)
+_PROFILE_COLUMNS = (
+    "id, email, username, full_name, created_at, last_login, "
+    "is_active, email_verified, tier, license_key"
+)
+
+# bcrypt cost factor for new password hashes (lower only for development)
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+
+# New hashes use Argon2id (OWASP parameters) when argon2-cffi is installed;
+# existing bcrypt hashes keep verifying and are upgraded on the next login
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+
+    _ARGON2 = PasswordHasher(
+        time_cost=2, memory_cost=19456, parallelism=1, hash_len=32, salt_len=16
+    )
+except ImportError:
+    _ARGON2 = None
+
+# Expired sessions are purged at most this often
+_SESSION_GC_INTERVAL_SECONDS = 300
+
+# validate_session results are reused for this long (bounded cache)
+_SESSION_CACHE_TTL_SECONDS = 30.0
+_SESSION_CACHE_MAX = 10_000
+
+# Failed logins allowed per client IP within the window before refusing
+LOGIN_MAX_FAILURES = int(os.getenv('LOGIN_MAX_FAILURES', '10'))
+_LOGIN_WINDOW_SECONDS = 60.0
+_LOGIN_TRACK_MAX = 10_000
+
+# Opt-in: remember successful password checks in memory so repeated logins
+# skip bcrypt. Off by default - the cache holds unsalted SHA-256 digests.
+_VERIFY_CACHE_ENABLED = os.getenv('BCRYPT_VERIFY_CACHE') == '1'
+_VERIFY_CACHE_MAX = 1024
+_verified = OrderedDict()
+_verified_lock = threading.Lock()
+
+
+def _hash_password(password: str):
+    """Hash a new password (Argon2id if available, bcrypt otherwise)"""
+    if _ARGON2 is not None:
+        return _ARGON2.hash(password)
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(BCRYPT_ROUNDS))
+
+
+def _is_argon2(password_hash) -> bool:
+    """Stored hashes are str (Argon2) or bytes (bcrypt, older rows)"""
+    return isinstance(password_hash, str) and password_hash.startswith('$argon2')
+
+
+def _needs_rehash(password_hash) -> bool:
+    """True if the stored hash should be replaced with a current-parameter hash"""
+    if _ARGON2 is None:
+        return False
+    if not _is_argon2(password_hash):
+        return True
+    return _ARGON2.check_needs_rehash(password_hash)
+
+
+def _verify_hash(password: str, password_hash) -> bool:
+    """Verify against an Argon2 or bcrypt hash"""
+    if _is_argon2(password_hash):
+        if _ARGON2 is None:
+            return False
+        try:
+            return _ARGON2.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    if isinstance(password_hash, str):
+        password_hash = password_hash.encode()
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash)
+
+
+@cache
+def _dummy_hash():
+    """Hash checked for unknown users so they take as long as a wrong password"""
+    return _hash_password(secrets.token_hex(16))
+
+
+def _check_password(password: str, password_hash) -> bool:
+    """
+    Password check, optionally backed by the in-memory success cache
+
+    Args:
+        password: Plain-text password
+        password_hash: Stored Argon2 or bcrypt hash
+
+    Returns:
+        True if the password matches
+    """
+    if not _VERIFY_CACHE_ENABLED:
+        return _verify_hash(password, password_hash)
+
+    key = (password_hash, hashlib.sha256(password.encode('utf-8')).digest())
+    with _verified_lock:
+        if key in _verified:
+            _verified.move_to_end(key)
+            return True
+
+    if not _verify_hash(password, password_hash):
+        return False
+
+    with _verified_lock:
+        _verified[key] = True
+        if len(_verified) > _VERIFY_CACHE_MAX:
+            _verified.popitem(last=False)
+    return True
+
 
 class UserManager:
     """Manage user accounts and authentication"""
@@ -22,12 +145,38 @@ class UserManager:
         # Create data directory if not exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
+        # One SQLite connection per thread, reused across calls
+        self._local = threading.local()
+
+        # Monotonic time of the last expired-session purge
+        self._last_gc = 0.0
+
+        # session_token -> (user data, monotonic expiry)
+        self._session_cache: Dict[str, Tuple[Dict, float]] = {}
+        self._session_cache_lock = threading.Lock()
+
+        # ip -> (monotonic window start, failed logins in window)
+        self._login_failures: Dict[str, Tuple[float, int]] = {}
+        self._login_failures_lock = threading.Lock()
+
         # Initialize database
         self._init_database()
 
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's database connection (opened on first use)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+        return conn
+
     def _init_database(self):
         """Create users table if not exists"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn()
         cursor = conn.cursor()
 
         # Users table
@@ -63,8 +212,31 @@ class UserManager:
             )
         """)
 
+        # Covers validate_session's token + expiry filter
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sessions_token_exp
+            ON sessions(session_token, expires_at)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sessions_user
+            ON sessions(user_id)
+        """)
+
         conn.commit()
-        conn.close()
+
+        # Refresh planner statistics so the new indexes are picked up
+        cursor.execute("ANALYZE")
+
+    def _maybe_gc(self):
+        """Delete expired sessions if the last purge is old enough"""
+        now = time.monotonic()
+        if now - self._last_gc < _SESSION_GC_INTERVAL_SECONDS:
+            return
+
+        self._last_gc = now
+        with self._conn() as conn:
+            conn.execute("DELETE FROM sessions WHERE expires_at <= CURRENT_TIMESTAMP")
 
     def register_user(self, email: str, username: str, password: str,
                      full_name: Optional[str] = None) -> Tuple[bool, str]:
@@ -85,19 +257,14 @@ class UserManager:
             return False, "Invalid email format"
 
         # Hash password
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        password_hash = _hash_password(password)
 
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT INTO users (email, username, password_hash, full_name)
-                VALUES (?, ?, ?, ?)
-            """, (email.lower(), username, password_hash, full_name))
-
-            conn.commit()
-            conn.close()
+            with self._conn() as conn:
+                conn.execute("""
+                    INSERT INTO users (email, username, password_hash, full_name)
+                    VALUES (?, ?, ?, ?)
+                """, (email.lower(), username, password_hash, full_name))
 
             return True, "Registration successful! Please login."
 
@@ -111,60 +278,87 @@ class UserManager:
         except Exception as e:
             return False, f"Error: {str(e)}"
 
-    def authenticate(self, username_or_email: str, password: str) -> Tuple[bool, Optional[Dict], str]:
+    def _login_blocked(self, ip_address: str, now: float) -> bool:
+        """True if ip_address used up its failed logins for the current window"""
+        with self._login_failures_lock:
+            entry = self._login_failures.get(ip_address)
+            return (entry is not None and now - entry[0] < _LOGIN_WINDOW_SECONDS
+                    and entry[1] >= LOGIN_MAX_FAILURES)
+
+    def _record_login_failure(self, ip_address: str, now: float):
+        """Count a failed login against ip_address (fixed one-minute window)"""
+        with self._login_failures_lock:
+            start, count = self._login_failures.get(ip_address, (now, 0))
+            if now - start >= _LOGIN_WINDOW_SECONDS:
+                # New window: re-insert so dict order stays window-start order
+                self._login_failures.pop(ip_address, None)
+                start, count = now, 0
+            self._login_failures[ip_address] = (start, count + 1)
+
+            # Over the cap: evict the oldest windows, expired or not
+            while len(self._login_failures) > _LOGIN_TRACK_MAX:
+                del self._login_failures[next(iter(self._login_failures))]
+
+    def authenticate(self, username_or_email: str, password: str,
+                     ip_address: str = None) -> Tuple[bool, Optional[Dict], str]:
         """
         Authenticate user
 
+        Args:
+            username_or_email: Username or email address
+            password: Plain-text password
+            ip_address: Client IP for failed-login rate limiting (optional)
+
         Returns:
             (success, user_data, message)
         """
+        now = time.monotonic()
+        if ip_address and self._login_blocked(ip_address, now):
+            return False, None, "Too many failed login attempts. Please try again in a minute."
+
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = self._conn()
             cursor = conn.cursor()
 
-            # Check if input is email or username
+            # Check if input is email or username (only what the password check needs)
             if '@' in username_or_email:
                 cursor.execute("""
-                    SELECT * FROM users
+                    SELECT id, password_hash FROM users
                     WHERE email = ? AND is_active = 1
                 """, (username_or_email.lower(),))
             else:
                 cursor.execute("""
-                    SELECT * FROM users
+                    SELECT id, password_hash FROM users
                     WHERE username = ? AND is_active = 1
                 """, (username_or_email,))
 
             user = cursor.fetchone()
 
             if not user:
-                conn.close()
+                # Same cost as a wrong password, so unknown users can't be told apart by timing
+                _verify_hash(password, _dummy_hash())
+                if ip_address:
+                    self._record_login_failure(ip_address, now)
                 return False, None, "Invalid credentials"
 
             # Verify password
-            if bcrypt.checkpw(password.encode('utf-8'), user['password_hash']):
-                # Update last login
-                cursor.execute("""
-                    UPDATE users SET last_login = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (user['id'],))
-                conn.commit()
-
-                # Convert to dict
-                user_data = {
-                    'id': user['id'],
-                    'email': user['email'],
-                    'username': user['username'],
-                    'full_name': user['full_name'],
-                    'tier': user['tier'],
-                    'license_key': user['license_key'],
-                    'created_at': user['created_at']
-                }
-
-                conn.close()
+            if _check_password(password, user['password_hash']):
+                # Update last login and fetch the profile in one statement
+                # (RETURNING needs SQLite 3.35+)
+                with conn:
+                    if _needs_rehash(user['password_hash']):
+                        conn.execute("UPDATE users SET password_hash = ? WHERE id = ?",
+                                     (_hash_password(password), user['id']))
+                    user_data = dict(conn.execute("""
+                        UPDATE users SET last_login = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                        RETURNING id, email, username, full_name, tier, license_key, created_at
+                    """, (user['id'],)).fetchone())
+
                 return True, user_data, "Login successful"
             else:
-                conn.close()
+                if ip_address:
+                    self._record_login_failure(ip_address, now)
                 return False, None, "Invalid credentials"
 
         except Exception as e:
@@ -176,84 +370,82 @@ class UserManager:
         session_token = secrets.token_urlsafe(32)
         expires_at = datetime.now() + timedelta(days=7)  # 7 days session
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO sessions (user_id, session_token, expires_at, ip_address, user_agent)
-            VALUES (?, ?, ?, ?, ?)
-        """, (user_id, session_token, expires_at, ip_address, user_agent))
+        self._maybe_gc()
 
-        conn.commit()
-        conn.close()
+        with self._conn() as conn:
+            conn.execute("""
+                INSERT INTO sessions (user_id, session_token, expires_at, ip_address, user_agent)
+                VALUES (?, ?, ?, ?, ?)
+            """, (user_id, session_token, expires_at, ip_address, user_agent))
 
         return session_token
 
     def validate_session(self, session_token: str) -> Tuple[bool, Optional[Dict]]:
         """Validate session and return user data"""
+        now = time.monotonic()
+        hit = self._session_cache.get(session_token)
+        if hit is not None and hit[1] > now:
+            return True, dict(hit[0])
+
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            self._maybe_gc()
+
+            cursor = self._conn().cursor()
 
             cursor.execute("""
-                SELECT u.*, s.expires_at
+                SELECT u.id, u.email, u.username, u.full_name, u.tier, u.license_key
                 FROM users u
                 JOIN sessions s ON u.id = s.user_id
                 WHERE s.session_token = ? AND s.expires_at > CURRENT_TIMESTAMP
             """, (session_token,))
 
             user = cursor.fetchone()
-            conn.close()
 
             if user:
-                return True, {
-                    'id': user['id'],
-                    'email': user['email'],
-                    'username': user['username'],
-                    'full_name': user['full_name'],
-                    'tier': user['tier'],
-                    'license_key': user['license_key']
-                }
+                user_data = dict(user)
+                self._cache_session(session_token, user_data, now)
+                return True, dict(user_data)
             else:
                 return False, None
 
         except Exception:
             return False, None
 
+    def _cache_session(self, session_token: str, user_data: Dict, now: float):
+        """Remember a validated session for a short TTL (oldest entry evicted first)"""
+        with self._session_cache_lock:
+            cache = self._session_cache
+            cache.pop(session_token, None)
+            if len(cache) >= _SESSION_CACHE_MAX:
+                del cache[next(iter(cache))]
+            cache[session_token] = (user_data, now + _SESSION_CACHE_TTL_SECONDS)
+
     def delete_session(self, session_token: str):
         """Delete/logout session"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._session_cache_lock:
+            self._session_cache.pop(session_token, None)
 
-        cursor.execute("DELETE FROM sessions WHERE session_token = ?", (session_token,))
-
-        conn.commit()
-        conn.close()
+        with self._conn() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_token = ?", (session_token,))
 
     def update_user_tier(self, user_id: int, tier: str, license_key: str = None):
         """Update user's tier and license"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            UPDATE users
-            SET tier = ?, license_key = ?
-            WHERE id = ?
-        """, (tier, license_key, user_id))
+        with self._conn() as conn:
+            conn.execute("""
+                UPDATE users
+                SET tier = ?, license_key = ?
+                WHERE id = ?
+            """, (tier, license_key, user_id))
 
-        conn.commit()
-        conn.close()
+        # Cached sessions carry the old tier
+        with self._session_cache_lock:
+            self._session_cache.clear()
 
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """Get user data by ID"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-        user = cursor.fetchone()
-        conn.close()
+        user = self._conn().execute(
+            f"SELECT {_PROFILE_COLUMNS} FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
 
         if user:
             return dict(user)
@@ -261,13 +453,9 @@ class UserManager:
 
     def get_user_by_email(self, email: str) -> Optional[Dict]:
         """Get user data by email"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM users WHERE email = ?", (email.lower(),))
-        user = cursor.fetchone()
-        conn.close()
+        user = self._conn().execute(
+            f"SELECT {_PROFILE_COLUMNS} FROM users WHERE email = ?", (email.lower(),)
+        ).fetchone()
 
         if user:
             return dict(user)
@@ -275,28 +463,32 @@ class UserManager:
 
     def _is_valid_email(self, email: str) -> bool:
         """Basic email validation"""
-        import re
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return len(email) <= EMAIL_MAX_LENGTH and _EMAIL_RE.match(email) is not None
 
     def get_total_users(self) -> int:
         """Get total registered users"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT COUNT(*) FROM users")
-        count = cursor.fetchone()[0]
-
-        conn.close()
-        return count
-
-
-# Singleton instance
-_user_manager = None
-
-def get_user_manager() -> UserManager:
-    """Get singleton UserManager instance"""
-    global _user_manager
-    if _user_manager is None:
-        _user_manager = UserManager()
-    return _user_manager
+        return self._conn().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+
+# Under Streamlit the instance lives in the resource cache (shared by all
+# sessions, survives reruns); elsewhere fall back to a module singleton
+try:
+    import streamlit as st
+except ImportError:
+    st = None
+
+if st is not None:
+    @st.cache_resource(show_spinner=False)
+    def get_user_manager() -> UserManager:
+        """Get shared UserManager instance"""
+        return UserManager()
+else:
+    # Singleton instance
+    _user_manager = None
+
+    def get_user_manager() -> UserManager:
+        """Get singleton UserManager instance"""
+        global _user_manager
+        if _user_manager is None:
+            _user_manager = UserManager()
+        return _user_manager
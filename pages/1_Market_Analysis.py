@@ -5,29 +5,18 @@ Real-time market scanning and signal detection
 
 import streamlit as st
 import asyncio
-import pandas as pd
-import plotly.graph_objects as go
+import time
 from datetime import datetime, timedelta
-import sys
-from pathlib import Path
-import numpy as np
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from modules.page_boot import configure
 from modules.config import ALLOWED_PAIRS, SCALPING_CONFIG, BINANCE_TESTNET
 from modules.tier_manager import TierManager
 from modules.data_fetcher import DataFetcher
+from modules.market_async import scan_all_sync
 from modules.backtester import relaxed_ema_crossover_signals
-from modules.pwa_support import inject_pwa_support
-from modules.responsive_layout import apply_responsive_layout
-
-st.set_page_config(page_title="Market Analysis", page_icon="📈", layout="wide")
-
-# 💻 PWA Support
-inject_pwa_support()
 
-# 📱 Responsive Layout
-apply_responsive_layout()
+# Page config, PWA, responsive layout, session
+configure("Market Analysis", "📈", layout="wide")
 
 # Dark Theme CSS with Green Glow
 st.markdown("""
@@ -233,16 +222,83 @@ def fetch_live_data(symbol, interval):
         st.error(f"Error fetching data: {e}")
         return None
 
-# Analysis Results
-col1, col2 = st.columns([2, 1])
-
-with col1:
-    st.markdown('<div class="section-header">📊 Technical Analysis</div>', unsafe_allow_html=True)
+@st.cache_data(ttl=30)  # Same window as fetch_live_data
+def _build_price_fig(symbol, timeframe, _df):
+    """
+    Candlestick + EMA chart for the last 100 bars (reused across reruns)
+
+    Keyed on (symbol, timeframe) only - the leading underscore keeps
+    Streamlit from hashing the DataFrame the caller already fetched.
+    """
+    # PRO-only, so plotly is imported on first use rather than for every page load
+    import plotly.graph_objects as go
+
+    chart_df = _df.tail(100)
+
+    fig = go.Figure()
+
+    # Candlestick
+    fig.add_trace(go.Candlestick(
+        x=chart_df.index,
+        open=chart_df['open'],
+        high=chart_df['high'],
+        low=chart_df['low'],
+        close=chart_df['close'],
+        name='Price'
+    ))
+
+    # EMAs
+    fig.add_trace(go.Scatter(
+        x=chart_df.index,
+        y=chart_df['ema_8'],
+        mode='lines',
+        name='EMA 8',
+        line=dict(color='blue', width=1)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=chart_df.index,
+        y=chart_df['ema_21'],
+        mode='lines',
+        name='EMA 21',
+        line=dict(color='orange', width=1)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=chart_df.index,
+        y=chart_df['ema_50'],
+        mode='lines',
+        name='EMA 50',
+        line=dict(color='red', width=1.5)
+    ))
+
+    fig.update_layout(
+        title=f"{symbol} - {timeframe}",
+        xaxis_title="Time",
+        yaxis_title="Price (USDT)",
+        height=400,
+        xaxis_rangeslider_visible=False
+    )
 
+    return fig
+
+def _live_df(symbol, timeframe):
+    """
+    Data fetched by the current full run, if it's for this pair and still
+    fresh; otherwise fetch_live_data (fragment-only reruns skip the full run)
+    """
+    stash = st.session_state.get('_live_df')
+    if stash and stash[:2] == (symbol, timeframe) and time.monotonic() - stash[2] < 30:
+        return stash[3]
+    return fetch_live_data(symbol, timeframe)
+
+@st.fragment
+def _scan_fragment(symbol, timeframe, auto_refresh):
+    """Scan Market button and its results (reruns on its own when clicked)"""
     # Fetch data button
     if st.button("🚀 Scan Market", type="primary", use_container_width=True) or auto_refresh:
-        with st.spinner(f"Fetching live {selected_symbol} data from Binance..."):
-            df = fetch_live_data(selected_symbol, timeframe)
+        with st.spinner(f"Fetching live {symbol} data from Binance..."):
+            df = _live_df(symbol, timeframe)
 
             if df is not None and len(df) > 0:
                 # Get latest candle
@@ -379,12 +435,24 @@ Waiting for better setup with 4+ confirmations.
             else:
                 st.error("❌ Failed to fetch market data. Please try again.")
 
+
+# Fetched once per full run and shared by both columns (each cached call
+# would otherwise return its own unpickled copy of the DataFrame)
+df = fetch_live_data(selected_symbol, timeframe)
+st.session_state['_live_df'] = (selected_symbol, timeframe, time.monotonic(), df)
+
+# Analysis Results
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    st.markdown('<div class="section-header">📊 Technical Analysis</div>', unsafe_allow_html=True)
+
+    _scan_fragment(selected_symbol, timeframe, auto_refresh)
+
 with col2:
     st.markdown('<div class="section-header">🎯 Key Levels</div>', unsafe_allow_html=True)
 
-    # Fetch data for support/resistance
-    df = fetch_live_data(selected_symbol, timeframe)
-
+    # Support/resistance from the data fetched above
     if df is not None and len(df) > 0:
         latest = df.iloc[-1]
 
@@ -403,76 +471,45 @@ with col2:
         st.markdown("#### Price Chart (Last 100 bars)")
 
         if st.session_state.tier != 'free':
-            # Plot real price chart
-            chart_df = df.tail(100)
-
-            fig = go.Figure()
-
-            # Candlestick
-            fig.add_trace(go.Candlestick(
-                x=chart_df.index,
-                open=chart_df['open'],
-                high=chart_df['high'],
-                low=chart_df['low'],
-                close=chart_df['close'],
-                name='Price'
-            ))
-
-            # EMAs
-            fig.add_trace(go.Scatter(
-                x=chart_df.index,
-                y=chart_df['ema_8'],
-                mode='lines',
-                name='EMA 8',
-                line=dict(color='blue', width=1)
-            ))
-
-            fig.add_trace(go.Scatter(
-                x=chart_df.index,
-                y=chart_df['ema_21'],
-                mode='lines',
-                name='EMA 21',
-                line=dict(color='orange', width=1)
-            ))
-
-            fig.add_trace(go.Scatter(
-                x=chart_df.index,
-                y=chart_df['ema_50'],
-                mode='lines',
-                name='EMA 50',
-                line=dict(color='red', width=1.5)
-            ))
-
-            fig.update_layout(
-                title=f"{selected_symbol} - {timeframe}",
-                xaxis_title="Time",
-                yaxis_title="Price (USDT)",
-                height=400,
-                xaxis_rangeslider_visible=False
-            )
-
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(_build_price_fig(selected_symbol, timeframe, df), use_container_width=True)
         else:
             st.info("📊 Interactive chart available in PRO tier")
     else:
         st.info("Click 'Scan Market' to load live data")
 
-# Multi-pair scanner
-if st.session_state.tier != 'free':
-    st.markdown("---")
-    st.markdown('<div class="section-header">🔍 Multi-Pair Scanner</div>', unsafe_allow_html=True)
+@st.cache_data(ttl=30)  # Same window as fetch_live_data
+def _scan_pairs(pairs, interval):
+    """Fetch and compute indicators for all pairs concurrently (tuple of pairs as cache key)"""
+    return scan_all_sync(fetcher, pairs, interval)
+
+
+# Scanner categories
+_SIGNALS = ("LONG", "SHORT", "NEUTRAL")
+_TRENDS = ("BULLISH", "BEARISH", "NEUTRAL")
+
+# Scanner row highlight per signal (NEUTRAL stays unstyled)
+_SIGNAL_CSS = {
+    "LONG": 'background-color: rgba(0, 255, 0, 0.2)',
+    "SHORT": 'background-color: rgba(255, 0, 0, 0.2)',
+}
 
+@st.fragment
+def _multi_pair_scan_fragment():
+    """Scan All Pairs button and its results (reruns on its own when clicked)"""
     if st.button("📡 Scan All Pairs", use_container_width=True):
-        scanner_results = []
+        # One list per column, typed when the DataFrame is built
+        pairs, signals, confidences, trends, rsis, prices = [], [], [], [], [], []
 
         progress_bar = st.progress(0)
         status_text = st.empty()
 
-        for i, pair in enumerate(ALLOWED_PAIRS[:5]):  # Scan first 5 pairs
-            status_text.text(f"Scanning {pair}...")
+        scan_pairs = ALLOWED_PAIRS[:5]  # Scan first 5 pairs
+        status_text.text(f"Scanning {len(scan_pairs)} pairs...")
 
-            df = fetch_live_data(pair, SCALPING_CONFIG.PRIMARY_TIMEFRAME)
+        # One concurrent batch instead of a round-trip per pair
+        frames = _scan_pairs(tuple(scan_pairs), SCALPING_CONFIG.PRIMARY_TIMEFRAME)
 
+        for i, (pair, df) in enumerate(zip(scan_pairs, frames)):
             if df is not None and len(df) > 0:
                 latest = df.iloc[-1]
                 prev = df.iloc[-2]
@@ -506,41 +543,54 @@ if st.session_state.tier != 'free':
                 if 30 < latest['rsi'] < 70:
                     conf += 1
 
-                scanner_results.append({
-                    "Pair": pair,
-                    "Signal": signal,
-                    "Confidence": f"{conf}/5",
-                    "Trend": trend,
-                    "RSI": f"{latest['rsi']:.1f}",
-                    "Price": f"${latest['close']:,.2f}"
-                })
+                pairs.append(pair)
+                signals.append(signal)
+                confidences.append(f"{conf}/5")
+                trends.append(trend)
+                rsis.append(latest['rsi'])
+                prices.append(latest['close'])
 
-            progress_bar.progress((i + 1) / 5)
+            progress_bar.progress((i + 1) / len(scan_pairs))
 
         status_text.text("✅ Scan complete!")
 
-        if scanner_results:
-            df_scanner = pd.DataFrame(scanner_results)
-
-            # Color code signals
-            def color_signal(val):
-                if val == "LONG":
-                    return 'background-color: rgba(0, 255, 0, 0.2)'
-                elif val == "SHORT":
-                    return 'background-color: rgba(255, 0, 0, 0.2)'
-                else:
-                    return ''
+        if pairs:
+            import numpy as np
+            import pandas as pd
+            df_scanner = pd.DataFrame({
+                "Pair": pairs,
+                "Signal": pd.Categorical(signals, categories=_SIGNALS),
+                "Confidence": confidences,
+                "Trend": pd.Categorical(trends, categories=_TRENDS),
+                "RSI": np.asarray(rsis, dtype=np.float32),
+                "Price": np.asarray(prices, dtype=np.float64),
+            })
+
+            # Color code signals: CSS per category, then indexed by the codes
+            def color_signals(col):
+                css = np.array([_SIGNAL_CSS.get(s, '') for s in col.cat.categories], dtype=object)
+                return css[col.cat.codes]
 
             st.dataframe(
-                df_scanner.style.applymap(color_signal, subset=['Signal']),
+                df_scanner.style
+                .apply(color_signals, subset=['Signal'])
+                .format({"RSI": "{:.1f}", "Price": "${:,.2f}"}),
                 use_container_width=True
             )
 
-            st.success(f"✅ Scan complete! Found {len([r for r in scanner_results if r['Signal'] != 'NEUTRAL'])} opportunities.")
+            opportunities = int((df_scanner["Signal"] != "NEUTRAL").sum())
+            st.success(f"✅ Scan complete! Found {opportunities} opportunities.")
+
+
+# Multi-pair scanner
+if st.session_state.tier != 'free':
+    st.markdown("---")
+    st.markdown('<div class="section-header">🔍 Multi-Pair Scanner</div>', unsafe_allow_html=True)
+
+    _multi_pair_scan_fragment()
 
 # Auto-refresh
 if auto_refresh:
-    import time
     time.sleep(30)
     st.rerun()
 
@@ -160,6 +160,21 @@ st.header("🧪 Test Notifications")
 
 st.markdown("Send test notifications to verify your Telegram setup:")
 
+def _deliver(notification) -> bool:
+    """
+    Run a notify_* coroutine and wait until its message has really gone out
+
+    notify_* only queue the message for the background sender, so flush()
+    before reporting success.
+    """
+    async def run():
+        failed = notifier.failed_sends
+        await notification
+        return await notifier.flush(timeout=15) and notifier.failed_sends == failed
+
+    return asyncio.run(run())
+
+
 col1, col2 = st.columns(2)
 
 with col1:
@@ -168,8 +183,10 @@ with col1:
             st.error("❌ Please configure Telegram first!")
         else:
             try:
-                asyncio.run(notifier.send_message("✅ Test message from Binance Algo Bot!"))
-                st.success("✅ Message sent! Check your Telegram.")
+                if asyncio.run(notifier.send_message("✅ Test message from Binance Algo Bot!")):
+                    st.success("✅ Message sent! Check your Telegram.")
+                else:
+                    st.error("❌ Failed to send - check the logs")
             except Exception as e:
                 st.error(f"❌ Failed to send: {str(e)}")
 
@@ -178,7 +195,7 @@ with col1:
             st.error("❌ Please configure Telegram first!")
         else:
             try:
-                asyncio.run(notifier.notify_trade_entry({
+                delivered = _deliver(notifier.notify_trade_entry({
                     'symbol': 'BNBUSDT',
                     'side': 'LONG',
                     'entry_price': 245.30,
@@ -188,7 +205,10 @@ with col1:
                     'leverage': 5,
                     'risk_usd': 50.00
                 }))
-                st.success("✅ Trade entry notification sent!")
+                if delivered:
+                    st.success("✅ Trade entry notification sent!")
+                else:
+                    st.error("❌ Failed to send - check the logs")
             except Exception as e:
                 st.error(f"❌ Failed to send: {str(e)}")
 
@@ -197,7 +217,7 @@ with col1:
             st.error("❌ Please configure Telegram first!")
         else:
             try:
-                asyncio.run(notifier.notify_take_profit({
+                delivered = _deliver(notifier.notify_take_profit({
                     'symbol': 'BNBUSDT',
                     'tp_level': 1,
                     'price': 250.00,
@@ -205,7 +225,10 @@ with col1:
                     'profit': 45.30,
                     'percentage': 1.84
                 }))
-                st.success("✅ Take profit notification sent!")
+                if delivered:
+                    st.success("✅ Take profit notification sent!")
+                else:
+                    st.error("❌ Failed to send - check the logs")
             except Exception as e:
                 st.error(f"❌ Failed to send: {str(e)}")
 
@@ -215,14 +238,17 @@ with col2:
             st.error("❌ Please configure Telegram first!")
         else:
             try:
-                asyncio.run(notifier.notify_stop_loss({
+                delivered = _deliver(notifier.notify_stop_loss({
                     'symbol': 'BNBUSDT',
                     'price': 242.00,
                     'loss': -34.65,
                     'percentage': -1.35,
                     'reason': 'Stop Loss Hit'
                 }))
-                st.success("✅ Stop loss notification sent!")
+                if delivered:
+                    st.success("✅ Stop loss notification sent!")
+                else:
+                    st.error("❌ Failed to send - check the logs")
             except Exception as e:
                 st.error(f"❌ Failed to send: {str(e)}")
 
@@ -231,12 +257,15 @@ with col2:
             st.error("❌ Please configure Telegram first!")
         else:
             try:
-                asyncio.run(notifier.notify_risk_warning({
+                delivered = _deliver(notifier.notify_risk_warning({
                     'type': 'DAILY_LOSS_LIMIT',
                     'message': 'Daily loss limit approaching (4.2% of 5%)',
                     'severity': 'warning'
                 }))
-                st.success("✅ Risk warning sent!")
+                if delivered:
+                    st.success("✅ Risk warning sent!")
+                else:
+                    st.error("❌ Failed to send - check the logs")
             except Exception as e:
                 st.error(f"❌ Failed to send: {str(e)}")
 
@@ -245,7 +274,7 @@ with col2:
             st.error("❌ Please configure Telegram first!")
         else:
             try:
-                asyncio.run(notifier.send_daily_summary({
+                delivered = _deliver(notifier.send_daily_summary({
                     'total_trades': 12,
                     'wins': 8,
                     'losses': 4,
@@ -253,7 +282,10 @@ with col2:
                     'win_rate': 66.67,
                     'balance': 10234.56
                 }))
-                st.success("✅ Daily summary sent!")
+                if delivered:
+                    st.success("✅ Daily summary sent!")
+                else:
+                    st.error("❌ Failed to send - check the logs")
             except Exception as e:
                 st.error(f"❌ Failed to send: {str(e)}")
 
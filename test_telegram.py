@@ -68,6 +68,9 @@ async def test_telegram():
         print("✅ Daily summary sent!")
         print()
 
+        # Notifications are queued; wait for them before the loop exits
+        await notifier.flush(timeout=30)
+
         print("=" * 50)
         print("✅ ALL TESTS PASSED!")
         print("Check your Telegram to see the notifications")